@@ -11,6 +11,7 @@ Your Name
 """
 
 from hashqp import HashQP
+from prime import next_prime
 
 
 class _Entry:
@@ -43,10 +44,37 @@ class HashMap:
     Average-case O(1) for insert and lookup.
     """
 
-    def __init__(self):
-        self._table = HashQP()
+    def __init__(self, capacity=None):
+        """
+        capacity, if given, is how many keys are expected; the table is
+        sized up front so loading that many never rehashes.
+        """
+        if capacity is None:
+            self._table = HashQP()
+        else:
+            self._table = HashQP(self._table_size_for(capacity))
         self._size = 0
 
+    @staticmethod
+    def _table_size_for(capacity):
+        # HashQP rehashes once occupied / nbuckets reaches max_lambda
+        return next_prime(int(capacity / HashQP.INIT_MAX_LAMBDA) + 1)
+
+    @classmethod
+    def from_items(cls, items, capacity=None):
+        """
+        Bulk load (key, value) pairs.  The table is pre-sized from capacity,
+        or from len(items) if it has one, so the load never rehashes.
+        """
+        if capacity is None:
+            if not hasattr(items, "__len__"):
+                items = list(items)
+            capacity = len(items)
+        m = cls(capacity)
+        for key, value in items:
+            m[key] = value
+        return m
+
     def __len__(self):
         return self._size
 
@@ -99,3 +127,46 @@ class HashMap:
     def items(self):
         for entry in self._table:
             yield (entry.key, entry.value)
+
+
+class eBookIndex:
+    """
+    Indexes over a catalog of eBookEntry objects (e.g. an eBookEntryReader):
+    id -> book in one HashMap, and author -> [books], subject -> [books] in
+    two more, so lookups are O(1) by id and O(k) by author or subject.
+    All three tables are pre-sized from the number of books.
+    """
+
+    def __init__(self, books):
+        if not hasattr(books, "__len__"):
+            books = list(books)
+        n = len(books)
+        self._by_id = HashMap(n)
+        self._by_author = HashMap(n)
+        self._by_subject = HashMap(n)
+        for book in books:
+            self._by_id[book.id] = book
+            self._add(self._by_author, book.author, book)
+            self._add(self._by_subject, book.subject, book)
+
+    @staticmethod
+    def _add(index, key, book):
+        try:
+            index[key].append(book)
+        except KeyError:
+            index[key] = [book]
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def find(self, book_id):
+        """Return the book with this id, raise KeyError if there's none."""
+        return self._by_id[book_id]
+
+    def by_author(self, author):
+        """Return a list of the books by author (empty if none)."""
+        return list(self._by_author.get(author, ()))
+
+    def by_subject(self, subject):
+        """Return a list of the books with subject (empty if none)."""
+        return list(self._by_subject.get(subject, ()))
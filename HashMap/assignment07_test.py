@@ -6,12 +6,12 @@ Selma Emekci
 import unittest
 from pathlib import Path
 
-from assignment07 import HashMap
+from assignment07 import HashMap, eBookIndex
 
 # Try to import Gutenberg helpers in your repo
 _HAS_EBOOK = True
 try:
-    from ebook import eBookEntryReader
+    from ebook import eBookEntry, eBookEntryReader
 except Exception:
     _HAS_EBOOK = False
 
@@ -57,6 +57,54 @@ class HashMapCoreTests(unittest.TestCase):
             _ = m["nope"]
 
 
+class HashMapBulkLoadTests(unittest.TestCase):
+    def test_presized_never_rehashes(self):
+        m = HashMap(1000)
+        nbuckets = m._table._nbuckets
+        for i in range(1000):
+            m[i] = i * i
+        self.assertEqual(m._table._nbuckets, nbuckets)
+        self.assertEqual(m[999], 999 * 999)
+
+    def test_from_items(self):
+        pairs = [(f"k{i}", i) for i in range(500)]
+        m = HashMap.from_items(pairs)
+        self.assertEqual(len(m), 500)
+        self.assertEqual(m["k123"], 123)
+        m2 = HashMap.from_items(iter(pairs))
+        self.assertTrue(m == m2)
+
+
+@unittest.skipUnless(_HAS_EBOOK, "ebook module not available in this workspace")
+class eBookIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.books = [
+            eBookEntry(["Moby Dick", "Melville, Herman", "Whaling -- Fiction", "15"]),
+            eBookEntry(["Pride and Prejudice", "Austen, Jane", "England -- Fiction", "1342"]),
+            eBookEntry(["Moby Dick; Or, The Whale", "Melville, Herman", "Whaling -- Fiction", "2701"]),
+            eBookEntry(["Emma", "Austen, Jane", "Courtship -- Fiction", "158"]),
+        ]
+
+    def test_lookups(self):
+        index = eBookIndex(self.books)
+        self.assertEqual(len(index), 4)
+        self.assertEqual(index.find(1342).title, "Pride and Prejudice")
+        with self.assertRaises(KeyError):
+            index.find(1)
+        self.assertEqual([b.id for b in index.by_author("Austen, Jane")], [1342, 158])
+        self.assertEqual([b.id for b in index.by_subject("Whaling -- Fiction")], [15, 2701])
+        self.assertEqual(index.by_author("Nobody"), [])
+
+    def test_bulk_load_never_rehashes(self):
+        books = [eBookEntry([f"Title {i}", f"Author {i % 50}", f"Subject {i % 7}", str(i)])
+                 for i in range(2000)]
+        index = eBookIndex(iter(books))
+        nbuckets = HashMap._table_size_for(2000)
+        self.assertEqual(index._by_id._table._nbuckets, nbuckets)
+        self.assertEqual(index._by_author._table._nbuckets, nbuckets)
+        self.assertEqual(len(index.by_author("Author 7")), 40)
+
+
 @unittest.skipUnless(_HAS_EBOOK, "ebook module not available in this workspace")
 class HashMapGutenbergById(unittest.TestCase):
     def test_map_by_id(self):
@@ -6,7 +6,11 @@ Modified by Zibin Yang
 (Mainly, removed sort-by, because there's better alternative)
 """
 
+import os
+import struct
+import sys
 import xml.etree.ElementTree as ET
+from array import array
 from functools import total_ordering
 
 
@@ -52,51 +56,172 @@ class eBookEntry:
 
 
 class eBookEntryReader:
+    NS = {'gutenberg': 'http://www.gutenberg.org/rdfterms/',
+          'dcmi': 'http://purl.org/dc/elements/1.1/',
+          'dcterms': 'http://purl.org/dc/terms/',
+          'rdf': 'http://www.w3.org/1999/02/22-rdf-syntax-ns#'}
+    ETEXT_TAG = '{http://www.gutenberg.org/rdfterms/}etext'
 
-    def __init__(self, filename):
-        self._books = []
+    # Snapshot of the parsed catalog, <filename>.snapshot, little-endian:
+    # header (magic, version, source mtime in ns, source size, book count),
+    # then count int64 ids, 3 * count + 1 int64 offsets, and the UTF-8
+    # title/author/subject strings the offsets point into.
+    SNAPSHOT_MAGIC = b"EBK1"
+    SNAPSHOT_VERSION = 1
+    _SNAPSHOT_HEADER = struct.Struct("<4sIqqI")
+
+    def __init__(self, filename, use_snapshot=False):
+        """
+        If use_snapshot, load the parsed books from the snapshot file when
+        it matches the catalog, and parse the XML and (re)write the
+        snapshot otherwise.
+        """
+        self._books = None
         if len(filename) == 0:
             raise FileNotFoundError
-        tree = ET.parse(filename)
-        root = tree.getroot()
-
-        ns = {'gutenberg': 'http://www.gutenberg.org/rdfterms/',
-              'dcmi': 'http://purl.org/dc/elements/1.1/',
-              'dcterms': 'http://purl.org/dc/terms/',
-              'rdf': 'http://www.w3.org/1999/02/22-rdf-syntax-ns#'}
-
-        for book in root.findall('gutenberg:etext', ns):
-            ID = (book.attrib['{http://www.w3.org/1999/02/22-rdf-syntax-ns#}ID']).strip("etext")
-            title_el = book.find('dcmi:title', ns)
-            if title_el is None:
-                title = "(No Author)"
-            else:
-                title = title_el.text.replace('\n', '').replace('\r', '')
-            author_el = book.find('dcmi:creator', ns)
-            if author_el is None:
-                author = "(No Author)"
-            else:
-                author = author_el.text
-            subject = book.find('dcmi:subject', ns)
-
-            if subject is not None:
-                bag = subject.find('rdf:Bag', ns)
-                if bag is not None:
-                    subject = next(iter(bag))
-                lcsh = next(iter(subject))
-                value = next(iter(lcsh))
-                subject_text = value.text
-                if subject_text is None:
-                    subject_text = "No Subject"
-            else:
-                subject_text = "No Subject"
+        if use_snapshot:
+            self._books = eBookEntryReader._load_snapshot(filename)
 
-            entry = [title, author, subject_text, ID]
+        if self._books is None:
+            tree = ET.parse(filename)
+            root = tree.getroot()
 
-            self._books.append(eBookEntry(entry))
+            self._books = [eBookEntryReader._parse_book(book)
+                           for book in root.findall('gutenberg:etext', eBookEntryReader.NS)]
+            if use_snapshot:
+                eBookEntryReader._write_snapshot(filename, self._books)
 
         print(len(self._books), "titles loaded")
 
+    @staticmethod
+    def snapshot_filename(filename):
+        return f"{filename}.snapshot"
+
+    @staticmethod
+    def _write_snapshot(filename, books):
+        stat = os.stat(filename)
+        ids = array("q", (book.id for book in books))
+        offsets = array("q", [0])
+        blob = bytearray()
+        for book in books:
+            for s in (book.title, book.author, book.subject):
+                blob += s.encode("utf-8")
+                offsets.append(len(blob))
+        if sys.byteorder == "big":
+            ids.byteswap()
+            offsets.byteswap()
+
+        snapshot_filename = eBookEntryReader.snapshot_filename(filename)
+        tmp_filename = snapshot_filename + ".tmp"
+        try:
+            with open(tmp_filename, "wb") as fh:
+                fh.write(eBookEntryReader._SNAPSHOT_HEADER.pack(
+                    eBookEntryReader.SNAPSHOT_MAGIC,
+                    eBookEntryReader.SNAPSHOT_VERSION,
+                    stat.st_mtime_ns, stat.st_size, len(books)))
+                fh.write(ids.tobytes())
+                fh.write(offsets.tobytes())
+                fh.write(blob)
+            os.replace(tmp_filename, snapshot_filename)
+        except OSError:
+            # No snapshot is fine, we'll parse the XML again next time
+            pass
+
+    @staticmethod
+    def _load_snapshot(filename):
+        """
+        Return the list of eBookEntry from the snapshot, read in one go, or
+        None if it's missing, damaged or older than the catalog.
+        """
+        header = eBookEntryReader._SNAPSHOT_HEADER
+        try:
+            stat = os.stat(filename)
+            with open(eBookEntryReader.snapshot_filename(filename), "rb") as fh:
+                data = fh.read()
+        except OSError:
+            return None
+        if len(data) < header.size:
+            return None
+        magic, version, mtime_ns, size, count = header.unpack_from(data)
+        if (magic != eBookEntryReader.SNAPSHOT_MAGIC
+                or version != eBookEntryReader.SNAPSHOT_VERSION
+                or mtime_ns != stat.st_mtime_ns or size != stat.st_size):
+            return None
+
+        view = memoryview(data)
+        ids = array("q")
+        offsets = array("q")
+        ids_end = header.size + count * ids.itemsize
+        offsets_end = ids_end + (3 * count + 1) * offsets.itemsize
+        if len(data) < offsets_end:
+            return None
+        ids.frombytes(view[header.size:ids_end])
+        offsets.frombytes(view[ids_end:offsets_end])
+        if sys.byteorder == "big":
+            ids.byteswap()
+            offsets.byteswap()
+        blob = view[offsets_end:]
+        if len(blob) != offsets[-1]:
+            return None
+
+        strings = [str(blob[offsets[i]:offsets[i + 1]], "utf-8")
+                   for i in range(3 * count)]
+        return [eBookEntry([strings[3 * i], strings[3 * i + 1],
+                            strings[3 * i + 2], ids[i]])
+                for i in range(count)]
+
+    @staticmethod
+    def stream(filename):
+        """
+        Generator yielding each eBookEntry as soon as its gutenberg:etext
+        element is closed, using iterparse instead of building the whole
+        tree.  Processed elements are cleared, so memory stays flat no
+        matter how big the catalog is.  Doesn't print anything.
+        """
+        if len(filename) == 0:
+            raise FileNotFoundError
+        root = None
+        for event, elem in ET.iterparse(filename, events=("start", "end")):
+            if root is None:
+                root = elem
+            elif event == "end" and elem.tag == eBookEntryReader.ETEXT_TAG:
+                yield eBookEntryReader._parse_book(elem)
+                # Drop this book, and anything else finished before it
+                root.clear()
+
+    @staticmethod
+    def _parse_book(book):
+        """Make an eBookEntry from a gutenberg:etext element."""
+        ns = eBookEntryReader.NS
+        ID = (book.attrib['{http://www.w3.org/1999/02/22-rdf-syntax-ns#}ID']).strip("etext")
+        title_el = book.find('dcmi:title', ns)
+        # Empty elements (<dc:creator/>) have no text, same as missing ones
+        if title_el is None or title_el.text is None:
+            title = "(No Author)"
+        else:
+            title = title_el.text.replace('\n', '').replace('\r', '')
+        author_el = book.find('dcmi:creator', ns)
+        if author_el is None or author_el.text is None:
+            author = "(No Author)"
+        else:
+            author = author_el.text
+        subject = book.find('dcmi:subject', ns)
+
+        if subject is not None:
+            bag = subject.find('rdf:Bag', ns)
+            if bag is not None:
+                subject = next(iter(bag))
+            lcsh = next(iter(subject))
+            value = next(iter(lcsh))
+            subject_text = value.text
+            if subject_text is None:
+                subject_text = "No Subject"
+        else:
+            subject_text = "No Subject"
+
+        entry = [title, author, subject_text, ID]
+        return eBookEntry(entry)
+
     @staticmethod
     def _is_data_line(line):
         if len(line) < 1:
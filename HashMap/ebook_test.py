@@ -0,0 +1,131 @@
+"""
+eBook reader tests
+Selma Emekci
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from ebook import eBookEntry, eBookEntryReader
+
+# A few records in the same shape as the Project Gutenberg RDF catalog
+SAMPLE_CATALOG = """<?xml version="1.0" encoding="UTF-8"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+         xmlns:dc="http://purl.org/dc/elements/1.1/"
+         xmlns:dcterms="http://purl.org/dc/terms/"
+         xmlns:pgterms="http://www.gutenberg.org/rdfterms/">
+  <rdf:Description rdf:about="">
+    <dc:created>2008-01-01</dc:created>
+  </rdf:Description>
+  <pgterms:etext rdf:ID="etext15">
+    <dc:title>Moby Dick</dc:title>
+    <dc:creator>Melville, Herman, 1819-1891</dc:creator>
+    <dc:subject>
+      <rdf:Bag>
+        <rdf:li><dcterms:LCSH><rdf:value>Whaling -- Fiction</rdf:value></dcterms:LCSH></rdf:li>
+        <rdf:li><dcterms:LCSH><rdf:value>Sea stories</rdf:value></dcterms:LCSH></rdf:li>
+      </rdf:Bag>
+    </dc:subject>
+  </pgterms:etext>
+  <pgterms:etext rdf:ID="etext1342">
+    <dc:title>Pride and
+Prejudice</dc:title>
+    <dc:creator>Austen, Jane, 1775-1817</dc:creator>
+    <dc:subject>
+      <dcterms:LCSH><rdf:value>England -- Fiction</rdf:value></dcterms:LCSH>
+    </dc:subject>
+  </pgterms:etext>
+  <pgterms:etext rdf:ID="etext2701">
+    <dc:title>Moby Dick; Or, The Whale</dc:title>
+    <dc:creator>Melville, Herman, 1819-1891</dc:creator>
+    <dc:subject>
+      <dcterms:LCSH><rdf:value>Whaling -- Fiction</rdf:value></dcterms:LCSH>
+    </dc:subject>
+  </pgterms:etext>
+  <pgterms:etext rdf:ID="etext9999">
+    <dc:title>Untitled Pamphlet</dc:title>
+  </pgterms:etext>
+</rdf:RDF>
+"""
+
+
+class eBookTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.catalog = os.path.join(self._tmp.name, "catalog.rdf")
+        with open(self.catalog, "w", encoding="utf-8") as fh:
+            fh.write(SAMPLE_CATALOG)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def assertSameBooks(self, expected, actual):
+        self.assertEqual([str(b) for b in expected], [str(b) for b in actual])
+
+
+class eBookEntryReaderTests(eBookTestCase):
+    def test_reader(self):
+        books = list(eBookEntryReader(self.catalog))
+        self.assertEqual([b.id for b in books], [15, 1342, 2701, 9999])
+        self.assertEqual(books[0].subject, "Whaling -- Fiction")
+        self.assertEqual(books[1].title, "Pride andPrejudice")
+        self.assertEqual(books[3].author, "(No Author)")
+        self.assertEqual(books[3].subject, "No Subject")
+        self.assertEqual(books[2], 2701)
+
+    def test_stream_matches_reader(self):
+        stream = eBookEntryReader.stream(self.catalog)
+        first = next(stream)
+        self.assertIsInstance(first, eBookEntry)
+        self.assertEqual(first.id, 15)
+        self.assertSameBooks(list(eBookEntryReader(self.catalog)),
+                             [first] + list(stream))
+
+
+class eBookSnapshotTests(eBookTestCase):
+    def test_snapshot(self):
+        expected = list(eBookEntryReader(self.catalog))
+        self.assertSameBooks(expected,
+                             list(eBookEntryReader(self.catalog, use_snapshot=True)))
+        self.assertTrue(os.path.exists(eBookEntryReader.snapshot_filename(self.catalog)))
+
+        # Second load comes from the snapshot without touching the XML
+        with mock.patch.object(eBookEntryReader, "_parse_book",
+                               side_effect=AssertionError("parsed XML")):
+            self.assertSameBooks(expected,
+                                 list(eBookEntryReader(self.catalog, use_snapshot=True)))
+
+    def test_snapshot_invalidated_by_source_change(self):
+        eBookEntryReader(self.catalog, use_snapshot=True)
+        with open(self.catalog, "w", encoding="utf-8") as fh:
+            fh.write(SAMPLE_CATALOG.replace("Moby Dick</dc:title>",
+                                            "Moby Dick, Revised</dc:title>"))
+        books = list(eBookEntryReader(self.catalog, use_snapshot=True))
+        self.assertEqual(books[0].title, "Moby Dick, Revised")
+
+    def test_snapshot_empty_creator(self):
+        with open(self.catalog, "w", encoding="utf-8") as fh:
+            fh.write(SAMPLE_CATALOG.replace(
+                "<dc:creator>Austen, Jane, 1775-1817</dc:creator>",
+                "<dc:creator/>"))
+        expected = list(eBookEntryReader(self.catalog))
+        self.assertEqual(expected[1].author, "(No Author)")
+        self.assertSameBooks(expected,
+                             list(eBookEntryReader(self.catalog, use_snapshot=True)))
+        self.assertSameBooks(expected,
+                             list(eBookEntryReader(self.catalog, use_snapshot=True)))
+
+    def test_damaged_snapshot(self):
+        eBookEntryReader(self.catalog, use_snapshot=True)
+        snapshot = eBookEntryReader.snapshot_filename(self.catalog)
+        with open(snapshot, "r+b") as fh:
+            fh.truncate(40)
+        self.assertIsNone(eBookEntryReader._load_snapshot(self.catalog))
+        self.assertEqual(len(eBookEntryReader(self.catalog, use_snapshot=True)), 4)
+        self.assertIsNotNone(eBookEntryReader._load_snapshot(self.catalog))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -195,19 +195,20 @@ class HashQP:
         Return the ACTIVE item x such that (x == key) holds.
         Raise KeyError if not found.
         """
-        bucket = self._find_pos(key)
-        slot = self._buckets[bucket]
-        if slot._state == HashEntry.State.ACTIVE:
-            return slot._data
-        raise KeyError(key)
+        for bucket_index in self._iter_index(key):
+            bucket = self._buckets[bucket_index]
+            if bucket.state == Bucket.State.ACTIVE and bucket.item == key:
+                return bucket.item
+            elif bucket.state == Bucket.State.EMPTY:
+                raise KeyError(key)
 
     def __iter__(self):
         """
         Iterate over ACTIVE items in bucket order.
         """
-        for slot in self._buckets:
-            if slot._state == HashEntry.State.ACTIVE:
-                yield slot._data
+        for bucket in self._buckets:
+            if bucket.state == Bucket.State.ACTIVE:
+                yield bucket.item
 
     def __eq__(self, other):
         """
@@ -215,7 +216,7 @@ class HashQP:
         """
         if not isinstance(other, HashQP):
             return False
-        if self.nitems != other.nitems:
+        if self.size != other.size:
             return False
         for item in self:
             if item not in other:
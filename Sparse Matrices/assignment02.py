@@ -32,12 +32,15 @@ class SparseMatrix:
     Sparse matrix using an OrderedLinkedList for each row.
     """
 
-    def __init__(self, nrows, ncols, default_value):
+    def __init__(self, nrows, ncols, default_value,
+                 row_type=OrderedLinkedList):
         """
         Initialize a sparse matrix.
         :param nrows: number of rows (> 0)
         :param ncols: number of columns (> 0)
         :param default_value: default value for all cells not explicitly set
+        :param row_type: ordered container class used for each row, e.g.
+            OrderedSkipList for wide rows with many non-default entries
         """
         if nrows <= 0 or ncols <= 0:
             raise ValueError("Matrix dimensions must be positive.")
@@ -45,7 +48,8 @@ class SparseMatrix:
         self._nrows = nrows
         self._ncols = ncols
         self._default = default_value
-        self._rows = [OrderedLinkedList() for _ in range(nrows)]
+        self._row_type = row_type
+        self._rows = [row_type() for _ in range(nrows)]
         self.clear()
     
     def _validate_row(self, row):
@@ -61,7 +65,7 @@ class SparseMatrix:
 
     def clear(self):
         """Remove all non-default entries from the matrix."""
-        self._rows = [OrderedLinkedList() for _ in range(self._nrows)]
+        self._rows = [self._row_type() for _ in range(self._nrows)]
 
     def get(self, row, col):
         """
@@ -131,7 +135,7 @@ class SparseMatrix:
 
     def _get_row_list(self, row):
         """
-        Return the row's OrderedLinkedList.
+        Return the row's ordered container (an OrderedLinkedList by default).
         """
         return self._rows[row]
 
@@ -4,8 +4,10 @@ Selma Emekci
 Screaming crying throwing up aggggggghhhhhhhh
 """
 
+import random
 import unittest
 from assignment02 import SparseMatrix
+from linkedlist import OrderedArrayList, OrderedLinkedList, OrderedSkipList
 
 
 class SparseMatrixBasicsTests(unittest.TestCase):
@@ -66,5 +68,32 @@ class SparseMatrixBasicsTests(unittest.TestCase):
             list(sm.get_col(10))
 
 
+class SparseMatrixRowTypeTests(unittest.TestCase):
+    """
+    Every row container should give the same matrix.
+    """
+    def test_row_types_agree(self):
+        rng = random.Random(7)
+        matrices = [SparseMatrix(3, 50, 0, row_type=t)
+                    for t in (OrderedLinkedList, OrderedSkipList,
+                              OrderedArrayList)]
+        for _ in range(500):
+            r, c, v = rng.randrange(3), rng.randrange(50), rng.randrange(4)
+            for sm in matrices:
+                sm.set(r, c, v)
+        expected = str(matrices[0])
+        for sm in matrices[1:]:
+            self.assertEqual(expected, str(sm))
+            self.assertEqual(list(matrices[0].get_col(5)),
+                             list(sm.get_col(5)))
+
+    def test_clear_keeps_row_type(self):
+        sm = SparseMatrix(2, 2, 0, row_type=OrderedSkipList)
+        sm.set(0, 0, 1)
+        sm.clear()
+        self.assertIsInstance(sm._get_row_list(0), OrderedSkipList)
+        self.assertEqual(len(sm._get_row_list(0)), 0)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -7,39 +7,44 @@ Copyright 2022 Zibin Yang
 Modified by Selma Emekci
 """
 
+import random
+from bisect import bisect_left, bisect_right
+
 
 class LinkedListNode:
+    # Plain slotted attributes instead of properties over _data/_next: no
+    # per-node __dict__, and no function call on every .data/.next in the
+    # traversal loops below.
+    __slots__ = ("data", "next")
+
     def __init__(self, data):
         self.data = data
         self.next = None
 
-    @property
-    def data(self):
-        return self._data
-
-    @data.setter
-    def data(self, new_data):
-        self._data = new_data
-
-    @property
-    def next(self):
-        return self._next
-
-    @next.setter
-    def next(self, new_next):
-        self._next = new_next
-
     def __str__(self):
-        return f"{self._data}"
+        return f"{self.data}"
 
     def __repr__(self):
-        return f"data={self._data}, next={id(self._next)}"
+        return f"data={self.data}, next={id(self.next)}"
 
 
 class LinkedList:
-    def __init__(self, iterable=None):
+    def __init__(self, iterable=None, indexed=False):
+        """
+        :param iterable: initial data, in order
+        :param indexed: if True, keep a cache of the nodes in a list so
+            list[i] is O(1); the cache is rebuilt (O(n)) on the first index
+            after a change that isn't append()/pop_tail()
+        """
         self._head = None
+        self._tail = None
         self._size = 0
+        self._indexed = indexed
+        # Cache of nodes by position in indexed mode, None when stale
+        self._nodes = None
+        # Bumped whenever a node is unlinked or its data replaced, so
+        # cursors know their remembered node may be stale.
+        self._version = 0
         # Added 4/5/21: made it easier to initialize the list
         if iterable is not None:
             try:
@@ -64,7 +69,51 @@ class LinkedList:
         node = LinkedListNode(data)
         node.next = self._head
         self._head = node
+        if self._tail is None:
+            self._tail = node
+        self._size += 1
+        self._nodes = None
+
+    def append(self, data):
+        """Add data at the end of the list, in O(1)."""
+        node = LinkedListNode(data)
+        if self._tail:
+            self._tail.next = node
+        else:
+            self._head = node
+        self._tail = node
         self._size += 1
+        if self._nodes is not None:
+            self._nodes.append(node)
+
+    def pop_tail(self):
+        """
+        Remove and return the last data.  O(1) in indexed mode, otherwise
+        O(n) to find the node before it (the list is singly linked).
+        :raise: IndexError if the list is empty
+        """
+        if self._tail is None:
+            raise IndexError("pop from empty list")
+        node = self._tail
+        if self._size == 1:
+            prev = None
+        elif self._indexed:
+            prev = self._node_at(self._size - 2)
+        else:
+            prev = self._head
+            while prev.next is not node:
+                prev = prev.next
+
+        if prev:
+            prev.next = None
+        else:
+            self._head = None
+        self._tail = prev
+        self._size -= 1
+        self._version += 1
+        if self._nodes is not None:
+            self._nodes.pop()
+        return node.data
 
     def __iter__(self):
         # https://docs.python.org/3/library/stdtypes.html#generator-types
@@ -85,24 +134,40 @@ class LinkedList:
         :return: data if it exists in the list
         :raise: KeyError if data is not in the list
         """
-        for d in self:
-            if d == data:
-                return d
+        curr = self._head
+        while curr:
+            if curr.data == data:
+                return curr.data
+            curr = curr.next
         raise KeyError(f"{data=} not found")
 
     def __contains__(self, data):
-        try:
-            self.find(data)
-            return True
-        except KeyError:
-            return False
+        curr = self._head
+        while curr:
+            if curr.data == data:
+                return True
+            curr = curr.next
+        return False
 
     def __getitem__(self, index):
         self._validate_index(index)
+        return self._node_at(index).data
+
+    def _node_at(self, index):
+        if self._indexed:
+            if self._nodes is None:
+                nodes = []
+                curr = self._head
+                while curr:
+                    nodes.append(curr)
+                    curr = curr.next
+                self._nodes = nodes
+            return self._nodes[index]
 
-        for i, d in enumerate(self):
-            if i == index:
-                return d
+        curr = self._head
+        for i in range(index):
+            curr = curr.next
+        return curr
 
     # Added 10/4/24 by Selma Emekci
     def __setitem__(self, index, new_data):
@@ -114,12 +179,11 @@ class LinkedList:
         self._validate_index(index)
 
         # Traverse to the node at the given index
-        curr = self._head
-        for i in range(index):
-            curr = curr.next
+        curr = self._node_at(index)
 
         # Update
         curr.data = new_data
+        self._version += 1
 
     def _validate_index(self, index):
         if not isinstance(index, int):
@@ -136,19 +200,57 @@ class LinkedList:
                     prev.next = curr.next
                 else:
                     self._head = curr.next
+                if curr is self._tail:
+                    self._tail = prev
                 self._size -= 1
+                self._version += 1
+                self._nodes = None
                 return
-            prev, curr = curr, curr.next
+            prev = curr
+            curr = curr.next
         raise KeyError(f"{data=} not found")
 
 
 class OrderedLinkedList(LinkedList):
-    def __init__(self, iterable=None):
+    def __init__(self, iterable=None, indexed=False):
         # Added 4/5/21: made it easier to initialize the list
-        super().__init__()
+        super().__init__(indexed=indexed)
         if iterable is not None:
-            for i in iterable:
-                self.add(i)
+            # Sort once and link, instead of add() each one, O(n^2)
+            self.merge_sorted(iterable)
+
+    @classmethod
+    def from_sorted(cls, iterable):
+        """
+        Build a list from data that is already in order, in O(n).
+        """
+        ordered_list = cls()
+        ordered_list.merge_sorted(iterable, presorted=True)
+        return ordered_list
+
+    def merge_sorted(self, iterable, presorted=False):
+        """
+        Add every element of iterable in one pass over the list: O(n + m)
+        if presorted, otherwise O(m log m) for sorting the m new elements
+        first.  Same result as add()ing them one by one: a new element goes
+        after any equal ones, including equal ones from iterable before it.
+        """
+        items = iterable if presorted else sorted(iterable)
+        prev, curr = None, self._head
+        for data in items:
+            while curr and not data < curr.data:
+                prev, curr = curr, curr.next
+            node = LinkedListNode(data)
+            node.next = curr
+            if prev:
+                prev.next = node
+            else:
+                self._head = node
+            if curr is None:
+                self._tail = node
+            prev = node
+            self._size += 1
+        self._nodes = None
 
     def add(self, data):
         prev, curr = None, self._head
@@ -166,16 +268,340 @@ class OrderedLinkedList(LinkedList):
             # prev is None, that means node is self._head
             self._head = node
         node.next = curr
+        if curr is None:
+            self._tail = node
 
         self._size += 1
+        self._nodes = None
 
     def add_to_head(self, data):
         raise NotImplementedError("Not supported")
 
+    def append(self, data):
+        raise NotImplementedError("Not supported")
+
     def find(self, data):
-        for d in self:
+        curr = self._head
+        while curr:
+            d = curr.data
             if d == data:
                 return d
             if data < d:
                 break
+            curr = curr.next
+        raise KeyError(f"{data=} not found")
+
+    def __contains__(self, data):
+        curr = self._head
+        while curr:
+            d = curr.data
+            if d == data:
+                return True
+            if data < d:
+                break
+            curr = curr.next
+        return False
+
+    def cursor(self):
+        """
+        Return an OrderedLinkedListCursor for ascending runs of find()/add().
+        """
+        return OrderedLinkedListCursor(self)
+
+
+class OrderedLinkedListCursor:
+    """
+    A finger into an OrderedLinkedList: find() and add() start from the node
+    the previous call stopped at when the new data isn't smaller, instead of
+    from the head, so an ascending sequence of n calls walks the list once,
+    amortized O(1) each.  Out-of-order data just starts from the head again.
+
+    remove() (or changing data by index) may unlink the remembered node, so
+    the cursor checks the list's _version and starts over if it changed.
+    """
+
+    def __init__(self, ordered_list):
+        self._list = ordered_list
+        self._node = None
+        self._version = ordered_list._version
+
+    def _start(self, data, strict):
+        """
+        Return the node to start searching after, None for the head.
+        With strict, its data must be < data; otherwise <= data.
+        """
+        node = self._node
+        if node is None or self._version != self._list._version:
+            return None
+        if data < node.data or (strict and not node.data < data):
+            return None
+        return node
+
+    def _remember(self, node):
+        self._node = node
+        self._version = self._list._version
+
+    def find(self, data):
+        """
+        :param data: the data to look for in the list
+        :return: data if it exists in the list
+        :raise: KeyError if data is not in the list
+        """
+        prev = self._start(data, strict=True)
+        curr = prev.next if prev else self._list._head
+        while curr:
+            d = curr.data
+            if d == data:
+                self._remember(curr)
+                return d
+            if data < d:
+                break
+            prev, curr = curr, curr.next
+        self._remember(prev)
+        raise KeyError(f"{data=} not found")
+
+    def __contains__(self, data):
+        try:
+            self.find(data)
+            return True
+        except KeyError:
+            return False
+
+    def add(self, data):
+        """Same as OrderedLinkedList.add(), starting from the cursor."""
+        ol = self._list
+        prev = self._start(data, strict=False)
+        curr = prev.next if prev else ol._head
+        while curr:
+            if data < curr.data:
+                break
+            prev, curr = curr, curr.next
+
+        node = LinkedListNode(data)
+        if prev:
+            prev.next = node
+        else:
+            ol._head = node
+        node.next = curr
+        if curr is None:
+            ol._tail = node
+        ol._size += 1
+        ol._nodes = None
+        self._remember(node)
+
+
+class OrderedArrayList:
+    """
+    Drop-in alternative to OrderedLinkedList backed by sorted Python lists
+    instead of nodes: find() is a binary search, O(log n), and add()/remove()
+    shift memory instead of walking pointers.
+
+    key, if given, maps data to what it's ordered by (e.g. a MatrixEntry to
+    its column); the keys are kept in a parallel list so bisect compares
+    them directly instead of calling data's __lt__().
+    """
+
+    def __init__(self, iterable=None, key=None):
+        self._key = key
+        self._data = []
+        self._keys = self._data if key is None else []
+        if iterable is not None:
+            for i in iterable:
+                self.add(i)
+
+    @property
+    def size(self):
+        return len(self._data)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __str__(self):
+        return " ".join(str(d) for d in self)
+
+    def _key_of(self, data):
+        return data if self._key is None else self._key(data)
+
+    def add(self, data):
+        # After any equal ones, same as OrderedLinkedList.add()
+        k = self._key_of(data)
+        i = bisect_right(self._keys, k)
+        self._data.insert(i, data)
+        if self._keys is not self._data:
+            self._keys.insert(i, k)
+
+    def add_to_head(self, data):
+        raise NotImplementedError("Not supported")
+
+    def _index_of(self, data):
+        k = self._key_of(data)
+        i = bisect_left(self._keys, k)
+        keys, items = self._keys, self._data
+        while i < len(keys) and not k < keys[i]:
+            if items[i] == data:
+                return i
+            i += 1
+        raise KeyError(f"{data=} not found")
+
+    def find(self, data):
+        """
+        :param data: the data to look for in the list
+        :return: data if it exists in the list
+        :raise: KeyError if data is not in the list
+        """
+        return self._data[self._index_of(data)]
+
+    def __contains__(self, data):
+        try:
+            self._index_of(data)
+            return True
+        except KeyError:
+            return False
+
+    def remove(self, data):
+        i = self._index_of(data)
+        del self._data[i]
+        if self._keys is not self._data:
+            del self._keys[i]
+
+    def __getitem__(self, index):
+        if not isinstance(index, int):
+            raise TypeError("index should be int")
+        if index < 0 or index >= self.size:
+            raise ValueError(f"index {index} is invalid")
+        return self._data[index]
+
+
+class SkipListNode:
+    """A skip list node: next[i] is the following node on level i."""
+    __slots__ = ("data", "next")
+
+    def __init__(self, data, level):
+        self.data = data
+        self.next = [None] * level
+
+    def __str__(self):
+        return f"{self.data}"
+
+
+class OrderedSkipList:
+    """
+    Drop-in alternative to OrderedLinkedList backed by a skip list: level 0
+    is an ordinary sorted linked list, and each node is also linked on
+    levels 1, 2, ... with probability 1/2, 1/4, ..., so find(), add() and
+    remove() take expected O(log n) hops instead of O(n).
+    """
+
+    MAX_LEVEL = 32
+
+    def __init__(self, iterable=None, seed=None):
+        self._head = SkipListNode(None, self.MAX_LEVEL)
+        self._level = 1
+        self._size = 0
+        self._random = random.Random(seed)
+        if iterable is not None:
+            for i in iterable:
+                self.add(i)
+
+    @property
+    def size(self):
+        return self._size
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        curr = self._head.next[0]
+        while curr:
+            yield curr.data
+            curr = curr.next[0]
+
+    def __str__(self):
+        return " ".join(str(d) for d in self)
+
+    def _random_level(self):
+        level = 1
+        while level < self.MAX_LEVEL and self._random.random() < 0.5:
+            level += 1
+        return level
+
+    def _predecessors(self, data, after_equal):
+        """
+        Return, for each level, the last node before data (or, if
+        after_equal, the last node not after data).
+        """
+        update = [self._head] * self.MAX_LEVEL
+        curr = self._head
+        for i in reversed(range(self._level)):
+            nxt = curr.next[i]
+            if after_equal:
+                while nxt and not data < nxt.data:
+                    curr, nxt = nxt, nxt.next[i]
+            else:
+                while nxt and nxt.data < data:
+                    curr, nxt = nxt, nxt.next[i]
+            update[i] = curr
+        return update
+
+    def add(self, data):
+        # After any equal ones, same as OrderedLinkedList.add()
+        update = self._predecessors(data, after_equal=True)
+        level = self._random_level()
+        self._level = max(self._level, level)
+        node = SkipListNode(data, level)
+        for i in range(level):
+            node.next[i] = update[i].next[i]
+            update[i].next[i] = node
+        self._size += 1
+
+    def add_to_head(self, data):
+        raise NotImplementedError("Not supported")
+
+    def _find_node(self, data):
+        update = self._predecessors(data, after_equal=False)
+        curr = update[0].next[0]
+        while curr and not data < curr.data:
+            if curr.data == data:
+                return update, curr
+            curr = curr.next[0]
         raise KeyError(f"{data=} not found")
+
+    def find(self, data):
+        """
+        :param data: the data to look for in the list
+        :return: data if it exists in the list
+        :raise: KeyError if data is not in the list
+        """
+        return self._find_node(data)[1].data
+
+    def __contains__(self, data):
+        try:
+            self._find_node(data)
+            return True
+        except KeyError:
+            return False
+
+    def remove(self, data):
+        update, node = self._find_node(data)
+        for i in range(len(node.next)):
+            # update[i] is before every node equal to data, so walk up to
+            # node in case other equal ones sit in between.
+            prev = update[i]
+            while prev.next[i] is not node:
+                prev = prev.next[i]
+            prev.next[i] = node.next[i]
+        while self._level > 1 and self._head.next[self._level - 1] is None:
+            self._level -= 1
+        self._size -= 1
+
+    def __getitem__(self, index):
+        if not isinstance(index, int):
+            raise TypeError("index should be int")
+        if index < 0 or index >= self.size:
+            raise ValueError(f"index {index} is invalid")
+        for i, d in enumerate(self):
+            if i == index:
+                return d
@@ -5,6 +5,7 @@ Copyright 2022 Zibin Yang
 Modified by Selma Emekci.
 """
 import copy
+import random
 import unittest
 from linkedlist import *
 
@@ -32,6 +33,12 @@ class LinkedListTestCase(unittest.TestCase):
         # Set comparison, assuming __iter__() works.
         self.assertEqual(data, {d for d in ll})
 
+    def testNodeSlots(self):
+        node = LinkedListNode(1)
+        self.assertFalse(hasattr(node, "__dict__"))
+        with self.assertRaises(AttributeError):
+            node.prev = None
+
     def testAddToHead(self):
         ll = LinkedList()
         ll.add_to_head(10)
@@ -150,6 +157,83 @@ class LinkedListTestCase(unittest.TestCase):
             ll.remove(123)
 
 
+class LinkedListTailTestCase(unittest.TestCase):
+    def assertTail(self, ll):
+        last = None
+        curr = ll._head
+        while curr:
+            last, curr = curr, curr.next
+        self.assertIs(last, ll._tail)
+
+    def testAppend(self):
+        ll = LinkedList()
+        for d in range(5):
+            ll.append(d)
+            self.assertTail(ll)
+        self.assertEqual(list(range(5)), list(ll))
+        self.assertEqual(5, len(ll))
+
+    def testPopTail(self):
+        for indexed in (False, True):
+            ll = LinkedList([1, 2, 3], indexed=indexed)
+            self.assertEqual(3, ll.pop_tail())
+            self.assertTail(ll)
+            ll.append(4)
+            self.assertEqual([1, 2, 4], list(ll))
+            self.assertEqual(4, ll.pop_tail())
+            self.assertEqual(2, ll.pop_tail())
+            self.assertEqual(1, ll.pop_tail())
+            self.assertIsNone(ll._head)
+            self.assertTail(ll)
+            with self.assertRaises(IndexError):
+                ll.pop_tail()
+
+    def testTailAfterMutations(self):
+        rng = random.Random(11)
+        for indexed in (False, True):
+            ll = LinkedList(indexed=indexed)
+            expected = []
+            for _ in range(300):
+                op = rng.randrange(4)
+                d = rng.randrange(30)
+                if op == 0:
+                    ll.add_to_head(d)
+                    expected.insert(0, d)
+                elif op == 1:
+                    ll.append(d)
+                    expected.append(d)
+                elif op == 2 and d in expected:
+                    ll.remove(d)
+                    expected.remove(d)
+                elif expected:
+                    self.assertEqual(expected.pop(), ll.pop_tail())
+                self.assertTail(ll)
+                self.assertEqual(expected, [ll[i] for i in range(len(ll))])
+
+    def testOrderedTail(self):
+        ol = OrderedLinkedList([5, 1], indexed=True)
+        ol.add(9)
+        self.assertTail(ol)
+        ol.merge_sorted([3, 12])
+        self.assertTail(ol)
+        ol.cursor().add(20)
+        self.assertTail(ol)
+        self.assertEqual([1, 3, 5, 9, 12, 20], [ol[i] for i in range(len(ol))])
+        self.assertEqual(20, ol.pop_tail())
+        ol.remove(12)
+        self.assertTail(ol)
+        self.assertEqual(9, ol[3])
+        with self.assertRaises(NotImplementedError):
+            ol.append(30)
+
+    def testIndexedSetItem(self):
+        ll = LinkedList(range(5), indexed=True)
+        self.assertEqual(3, ll[3])
+        ll[3] = 30
+        self.assertEqual(30, ll[3])
+        self.assertEqual([0, 1, 2, 30, 4], list(ll))
+
+
 class OrderedLinkedListTestCase(unittest.TestCase):
     # Added 4/5/21: made it easier to initialize the list
     def testInitWithIterable(self):
@@ -186,6 +270,177 @@ class OrderedLinkedListTestCase(unittest.TestCase):
         with self.assertRaises(KeyError):
             ll.find("no there")
 
+
+class OrderedLinkedListMergeTestCase(unittest.TestCase):
+    def testInitSameAsAdd(self):
+        rng = random.Random(9)
+        data = [[rng.randrange(20)] for _ in range(200)]
+        added = OrderedLinkedList()
+        for d in data:
+            added.add(d)
+        merged = OrderedLinkedList(data)
+        self.assertEqual(len(added), len(merged))
+        self.assertEqual([id(d) for d in added], [id(d) for d in merged])
+
+    def testFromSorted(self):
+        ol = OrderedLinkedList.from_sorted(range(10))
+        self.assertEqual(list(range(10)), list(ol))
+        self.assertEqual(10, len(ol))
+        ol = OrderedLinkedList.from_sorted(iter([]))
+        self.assertEqual(0, len(ol))
+
+    def testMergeSorted(self):
+        ol = OrderedLinkedList([2, 4, 6])
+        ol.merge_sorted([7, 1, 4, 0, 9])
+        self.assertEqual([0, 1, 2, 4, 4, 6, 7, 9], list(ol))
+        self.assertEqual(8, len(ol))
+        ol.merge_sorted(range(3), presorted=True)
+        self.assertEqual([0, 0, 1, 1, 2, 2, 4, 4, 6, 7, 9], list(ol))
+
+    def testMergeEqualGoAfter(self):
+        a, b, c = [1], [1], [1]
+        ol = OrderedLinkedList([a])
+        ol.merge_sorted([b, [0], c])
+        self.assertEqual([id(a), id(b), id(c)], [id(d) for d in ol][1:])
+
+
+class OrderedLinkedListCursorTestCase(unittest.TestCase):
+    def testAscendingAdd(self):
+        ol = OrderedLinkedList([5, 15])
+        c = ol.cursor()
+        for d in range(0, 20, 2):
+            c.add(d)
+        self.assertEqual(sorted([5, 15] + list(range(0, 20, 2))), list(ol))
+        self.assertEqual(12, len(ol))
+
+    def testOutOfOrder(self):
+        rng = random.Random(5)
+        ol = OrderedLinkedList()
+        c = ol.cursor()
+        expected = []
+        for _ in range(200):
+            d = rng.randrange(50)
+            c.add(d)
+            expected.append(d)
+        self.assertEqual(sorted(expected), list(ol))
+        for d in rng.sample(range(60), 60):
+            self.assertEqual(d in expected, d in c)
+
+    def testEqualGoAfter(self):
+        ol = OrderedLinkedList()
+        c = ol.cursor()
+        a, b = [1], [1]
+        c.add(a)
+        c.add(b)
+        c.add([0])
+        self.assertEqual([[0], a, b], list(ol))
+        self.assertIs(a, c.find([1]))
+        self.assertIs(a, ol.find([1]))
+
+    def testFindMissing(self):
+        ol = OrderedLinkedList([1, 3, 5])
+        c = ol.cursor()
+        with self.assertRaises(KeyError):
+            c.find(2)
+        self.assertEqual(3, c.find(3))
+        with self.assertRaises(KeyError):
+            c.find(6)
+        self.assertEqual(1, c.find(1))
+
+    def testRemoveInvalidates(self):
+        ol = OrderedLinkedList([1, 2, 3, 4])
+        c = ol.cursor()
+        self.assertEqual(3, c.find(3))
+        ol.remove(3)
+        # The remembered node is no longer in the list
+        c.add(3.5)
+        self.assertEqual([1, 2, 3.5, 4], list(ol))
+        self.assertFalse(3 in c)
+
+
+class OrderedArrayListTestCase(unittest.TestCase):
+    OrderedType = OrderedArrayList
+
+    def testSameAsOrderedLinkedList(self):
+        rng = random.Random(123)
+        ll = OrderedLinkedList()
+        al = self.OrderedType()
+        for _ in range(300):
+            d = rng.randrange(100)
+            if rng.random() < 0.3 and d in ll:
+                ll.remove(d)
+                al.remove(d)
+            else:
+                ll.add(d)
+                al.add(d)
+            self.assertEqual(len(ll), len(al))
+        self.assertEqual(list(ll), list(al))
+        self.assertEqual(str(ll), str(al))
+        for d in range(100):
+            self.assertEqual(d in ll, d in al)
+        self.assertEqual([ll[i] for i in range(len(ll))],
+                         [al[i] for i in range(len(al))])
+
+    def testInitWithIterable(self):
+        al = self.OrderedType([4, 2, 9])
+        self.assertEqual([2, 4, 9], list(al))
+
+    def testFailures(self):
+        al = self.OrderedType([1, 5])
+        with self.assertRaises(KeyError):
+            al.find(3)
+        with self.assertRaises(KeyError):
+            al.remove(3)
+        with self.assertRaises(NotImplementedError):
+            al.add_to_head(3)
+        with self.assertRaises(TypeError):
+            al["abc"]
+        with self.assertRaises(ValueError):
+            al[2]
+
+
+class OrderedArrayListKeyTestCase(unittest.TestCase):
+    class Cell:
+        def __init__(self, col, value):
+            self.col = col
+            self.value = value
+
+        def __eq__(self, other):
+            return self.col == other.col
+
+    def testKey(self):
+        Cell = self.Cell
+        al = OrderedArrayList(key=lambda c: c.col)
+        for col in [7, 3, 9, 1]:
+            al.add(Cell(col, col * 10))
+        self.assertEqual([1, 3, 7, 9], [c.col for c in al])
+        self.assertEqual(70, al.find(Cell(7, None)).value)
+        al.remove(Cell(3, None))
+        self.assertEqual([1, 7, 9], [c.col for c in al])
+        self.assertFalse(Cell(3, None) in al)
+
+
+class OrderedSkipListTestCase(OrderedArrayListTestCase):
+    OrderedType = OrderedSkipList
+
+    def testDuplicates(self):
+        sl = OrderedSkipList(seed=1)
+        a, b, c = [1], [1], [1]
+        for d in (a, b, c):
+            sl.add(d)
+        self.assertEqual([id(a), id(b), id(c)], [id(d) for d in sl])
+        sl.remove([1])
+        self.assertEqual([id(b), id(c)], [id(d) for d in sl])
+
+    def testLevelsShrink(self):
+        sl = OrderedSkipList(range(200), seed=2)
+        self.assertGreater(sl._level, 1)
+        for d in range(200):
+            sl.remove(d)
+        self.assertEqual(1, sl._level)
+        self.assertEqual([], list(sl))
+
+
 # Added 10/4/25 (Selma Emekci)
 class TestLinkedListSetItem(unittest.TestCase):
     """
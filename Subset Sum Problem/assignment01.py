@@ -6,6 +6,13 @@ Implements the subset sum algorithm using both iterative and recursive
 approaches (hopefully). 
 """
 
+import multiprocessing
+import os
+import time
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 
 class Subset:
     """
@@ -16,10 +23,15 @@ class Subset:
         self._items = set()
         self._sum = 0
 
-    def add(self, item):
-        """Add item (shallow, reference only)."""
+    def add(self, item, value=None):
+        """
+        Add item (shallow, reference only).
+        value is what item counts for in the sum; defaults to item itself.
+        """
         self._items.add(item)
-        self._sum += item  # relies on duck typing / operator overloading
+        if value is None:
+            value = item
+        self._sum += value  # relies on duck typing / operator overloading
 
     @property
     def sum(self):
@@ -43,57 +55,475 @@ class Subset:
         return f"{self._items} (sum={self._sum})"
 
 
-class Collection:
+class LinkedSubset:
     """
-    Collection of Subset objects.
+    Same interface as Subset, but shares structure instead of copying sets.
+
+    Each LinkedSubset only remembers the subset it grew from (_parent) and
+    the last item added, so copy() and add() are O(1) and a whole Collection
+    shares one tree of nodes.  The Python set is only built by to_set().
     """
+    __slots__ = ("_parent", "_item", "_sum")
 
     def __init__(self):
-        empty = Subset()
-        self._subsets = [empty]
+        self._parent = None  # None means this is the empty subset
+        self._item = None
+        self._sum = 0
+
+    def add(self, item, value=None):
+        """Add item (shallow, reference only), counting value in the sum."""
+        # Move what we have now into a new node and hang item off it
+        prev = self.copy()
+        self._parent = prev
+        self._item = item
+        self._sum += item if value is None else value
+
+    @property
+    def sum(self):
+        return self._sum
+
+    def copy(self):
+        """Return a copy of this subset; shares everything, O(1)."""
+        new_subset = LinkedSubset()
+        new_subset._parent = self._parent
+        new_subset._item = self._item
+        new_subset._sum = self._sum
+        return new_subset
+
+    def to_set(self):
+        items = set()
+        node = self
+        while node._parent is not None:
+            items.add(node._item)
+            node = node._parent
+        return items
+
+    def __eq__(self, other):
+        return self.to_set() == other.to_set()
+
+    def __str__(self):
+        return f"{self.to_set()} (sum={self._sum})"
+
+
+class Collection:
+    """
+    Collection of Subset objects, at most one per reachable sum.
+
+    Only one witness per sum is ever needed, so subsets are kept in a dict
+    keyed by sum, and the first subset to reach a sum is the one kept.
+    """
+
+    def __init__(self, subset_type=Subset):
+        """subset_type is Subset or LinkedSubset (cheaper copies)."""
+        empty = subset_type()
+        self._subsets = {0: empty}
+        self._best = 0
+
+    def __len__(self):
+        return len(self._subsets)
 
-    def expand_by(self, item, target):
+    def expand_by(self, item, target, remaining=None, value=None,
+                  deadline=None):
         """
         Expand collection by adding 'item' to each existing subset.
-        Skip new subsets whose sum would exceed target.
+        Skip new subsets whose sum would exceed target, or whose sum is
+        already in the collection.
+        If remaining (the total of the items not yet expanded, all assumed
+        non-negative) is given, also drop subsets that can no longer beat
+        the current best.
+        value is what item counts for, if not item itself.
+        deadline is a time.perf_counter() value; once it's passed the
+        expansion stops part way, keeping the new subsets made so far.
         """
-        new_subsets = []
-        for subset in self._subsets:
+        if value is None:
+            value = item
+        new_subsets = {}
+        for count, (total, subset) in enumerate(self._subsets.items()):
+            if (deadline is not None and not count & 1023
+                    and time.perf_counter() >= deadline):
+                break
+            new_sum = total + value
+            if new_sum > target:
+                continue
+            if new_sum == target:
+                new_subset = subset.copy()
+                new_subset.add(item, value)
+                self._subsets[new_sum] = new_subset
+                self._best = new_sum
+                return new_subset
+            if new_sum in self._subsets or new_sum in new_subsets:
+                continue
             new_subset = subset.copy()
-            new_subset.add(item)
-            if new_subset.sum <= target:
-                if new_subset.sum == target:
-                    self._subsets.append(new_subset)
-                    return new_subset
-                new_subsets.append(new_subset)
-        self._subsets.extend(new_subsets)
+            new_subset.add(item, value)
+            new_subsets[new_sum] = new_subset
+        self._subsets.update(new_subsets)
+        if new_subsets:
+            self._best = max(self._best, max(new_subsets))
+        if remaining is not None:
+            self._prune(remaining)
         return None
 
+    def _prune(self, remaining):
+        best = self._best
+        self._subsets = {total: subset for total, subset in self._subsets.items()
+                         if total == best or total + remaining > best}
+
     @property
     def max_subset(self):
-        return max(self._subsets, key=lambda s: s.sum)
+        return self._subsets[self._best]
 
 
-def subset_sum(s, target):
+def _qualifies_for_dp(values, target):
     """
-    Iterative subset sum algorithm. Returns a Python set of items.
-    Raises ValueError if input has duplicates.
+    True if the DP engine can be used: the target is a positive int and all
+    values are non-negative ints (bool excluded, it's not a real number here).
+    """
+    if type(target) is not int or target <= 0:
+        return False
+    return all(type(v) is int and v >= 0 for v in values)
+
+
+def _default_method(values, target):
+    """
+    The engine to use when method= isn't given.
+
+    The DP's bitset and parent table grow with min(target, sum of values),
+    the Collection with the number of reachable sums, at most that and at
+    most 2^n.  So the DP is used unless 2^n is the smaller bound, e.g. a
+    few huge values, where the bitset alone could take gigabytes.
+    """
+    if (_qualifies_for_dp(values, target)
+            and 2 ** len(values) >= min(target, sum(values))):
+        return "dp"
+    return "collection"
+
+
+def _reachable_sums(values, limit, stop_at=None):
+    """
+    Bitset reachability over the sums 0..limit.
+
+    Bit r of the returned int is set if some subset of values sums to r.
+    parent[r] (an array indexed by sum, much smaller than a dict of the
+    same sums) is the index of the item that first made r reachable; since
+    items are processed in order, following parent pointers back from r
+    rebuilds the same subset the Collection would have found first.
+    If stop_at becomes reachable, return right away.
+    """
+    mask = (1 << (limit + 1)) - 1
+    reach = 1  # only the empty sum
+    parent = array("i", [0]) * (limit + 1)
+    for i, v in enumerate(values):
+        new_bits = ((reach << v) & mask) & ~reach
+        if not new_bits:
+            continue
+        reach |= new_bits
+        # Walk the newly set bits in C (str.find) instead of bit by bit.
+        bits = bin(new_bits)[:1:-1]
+        r = bits.find("1")
+        while r != -1:
+            parent[r] = i
+            r = bits.find("1", r + 1)
+        if stop_at is not None and (reach >> stop_at) & 1:
+            break
+    return reach, parent
+
+
+def _rebuild(items, values, parent, total):
+    """Follow parent pointers back from total and return the items as a set."""
+    result = set()
+    while total:
+        i = parent[total]
+        result.add(items[i])
+        total -= values[i]
+    return result
+
+
+def _dp_solve(items, values, target):
+    """
+    Pseudo-polynomial engine, O(n * target) bit operations.
+    values must be non-negative ints (see _qualifies_for_dp()).
+    """
+    limit = min(target, sum(values))
+    reach, parent = _reachable_sums(values, limit, stop_at=limit)
+    best = reach.bit_length() - 1
+    return _rebuild(items, values, parent, best)
+
+
+def subset_sum_dp(s, target):
+    """
+    Subset sum for non-negative int items using a reachable-sums bitset.
+    Returns the same Python set subset_sum() would, but in O(n * target)
+    instead of O(2^n).
+    Raises ValueError if input has duplicates or doesn't qualify.
     """
     items = list(s)
     if len(items) != len(set(items)):
         raise ValueError("Input contains duplicates")
+    if not _qualifies_for_dp(items, target):
+        raise ValueError("DP needs non-negative int items and a positive int target")
+    return _dp_solve(items, items, target)
 
-    col = Collection()
-    for x in items:
-        result = col.expand_by(x, target)
+
+def _half_sums(values, target):
+    """
+    Enumerate the subset sums of values that don't exceed target (all of
+    them if target is None).
+    Returns a dict of sum -> bitmask (bit i set means values[i] is in),
+    keeping only the first bitmask found for each sum.
+    """
+    sums = {0: 0}
+    for bit, v in enumerate(values):
+        new_sums = {}
+        for total, mask in sums.items():
+            new_total = total + v
+            if target is not None and new_total > target:
+                continue
+            if new_total not in sums:
+                new_sums.setdefault(new_total, mask | (1 << bit))
+        sums.update(new_sums)
+    return sums
+
+
+def _mitm_solve(items, values, target):
+    """
+    Horowitz-Sahni meet in the middle, O(2^(n/2) * n).
+
+    Enumerate the sums of each half, sort the right half's sums, then for
+    each left sum binary search for the largest right sum that still fits.
+    Works for any values that support + and <, not just ints.  With negative
+    values a partial sum over the target can still be brought back under it,
+    so the halves are then enumerated in full.
+    """
+    mid = len(items) // 2
+    bound = target if all(v >= 0 for v in values) else None
+    left = _half_sums(values[:mid], bound)
+    right = _half_sums(values[mid:], bound)
+    right_sums = sorted(right)
+
+    best, best_left, best_right = None, 0, 0
+    for left_sum, left_mask in left.items():
+        i = bisect_right(right_sums, target - left_sum) - 1
+        if i < 0:
+            continue
+        total = left_sum + right_sums[i]
+        if best is None or total > best:
+            best, best_left, best_right = total, left_mask, right[right_sums[i]]
+            if best == target:
+                break
+
+    mask = best_left | (best_right << mid)
+    return {item for i, item in enumerate(items) if (mask >> i) & 1}
+
+
+def _bnb_search(vals, target, start=0, total=0, shared_best=None):
+    """
+    Branch and bound over vals[start:], which must be sorted largest first.
+
+    Depth first, trying "include" before "exclude", with one shared stack of
+    included indices instead of a copied set per branch and a loop instead
+    of recursion.  A branch is cut as soon as everything left (suffix sums)
+    can't beat the best total so far, and the search stops on an exact hit.
+    Returns (best total, included indices), starting from a partial total.
+
+    shared_best is an optional multiprocessing.Value holding the best total
+    any process has found; it's published to and polled now and then, so
+    branches get cut against other workers' results too.
+    """
+    n = len(vals)
+    suffix = [0] * (n + 1)
+    for i in range(n - 1, start - 1, -1):
+        suffix[i] = vals[i] + suffix[i + 1]
+
+    best, best_stack = total, []
+    bound = best  # best total known anywhere, used for pruning
+    stack = []
+    # totals[k] is the total before stack[k] was taken; restoring it on the
+    # way back up (instead of subtracting) keeps float rounding from piling
+    # up and hiding an exact hit
+    totals = []
+    i = start
+    steps = 0
+    while True:
+        # Go down, taking every item that still fits
+        while i < n and total < target:
+            if total + suffix[i] <= bound:
+                break
+            if total + vals[i] <= target:
+                stack.append(i)
+                totals.append(total)
+                total += vals[i]
+            i += 1
+        if total > best:
+            best, best_stack = total, stack[:]
+            bound = max(bound, best)
+            if shared_best is not None:
+                with shared_best.get_lock():
+                    if best > shared_best.value:
+                        shared_best.value = best
+            if best == target:
+                break
+        if not stack:
+            break
+        steps += 1
+        if shared_best is not None and steps % 1024 == 0:
+            bound = max(bound, shared_best.value)
+            if bound >= target:
+                break  # somebody else hit the target exactly
+        # Back up: undo the last item taken and try the branch without it
+        i = stack.pop()
+        total = totals.pop()
+        i += 1
+    return best, best_stack
+
+
+def _bnb_solve(items, values, target):
+    if any(v < 0 for v in values):
+        raise ValueError("Branch and bound needs non-negative values")
+    order = sorted(range(len(values)), key=values.__getitem__, reverse=True)
+    _, chosen = _bnb_search([values[i] for i in order], target)
+    return {items[order[i]] for i in chosen}
+
+
+# Set in each worker process by _init_worker()
+_worker_args = None
+
+
+def _init_worker(vals, target, shared_best):
+    global _worker_args
+    _worker_args = (vals, target, shared_best)
+
+
+def _parallel_task(prefix_len, mask):
+    """
+    Search with the include/exclude choices for vals[:prefix_len] fixed by
+    the bits of mask.  Returns (best total, included indices) or None.
+    """
+    vals, target, shared_best = _worker_args
+    chosen = [i for i in range(prefix_len) if (mask >> i) & 1]
+    total = sum(vals[i] for i in chosen)
+    if total > target:
+        return None
+    best, stack = _bnb_search(vals, target, prefix_len, total, shared_best)
+    return best, chosen + stack
+
+
+def _parallel_solve(items, values, target, workers=None, prefix_len=None):
+    """
+    Branch and bound split over a process pool.
+
+    Every combination of include/exclude for the first prefix_len items
+    (largest first) is one task; workers share the best total so far and
+    the rest are cancelled once one of them hits the target exactly.
+    """
+    if any(v < 0 for v in values):
+        raise ValueError("Branch and bound needs non-negative values")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    order = sorted(range(len(values)), key=values.__getitem__, reverse=True)
+    vals = [values[i] for i in order]
+    if prefix_len is None:
+        # About 4 tasks per worker, so a slow prefix doesn't hold up the rest
+        prefix_len = (4 * workers - 1).bit_length()
+    prefix_len = min(prefix_len, len(vals))
+
+    shared_best = multiprocessing.Value("d", 0.0)
+    best, chosen = None, []
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(vals, target, shared_best)) as executor:
+        futures = [executor.submit(_parallel_task, prefix_len, mask)
+                   for mask in range(1 << prefix_len)]
+        for future in as_completed(futures):
+            result = future.result()
+            if result is None:
+                continue
+            if best is None or result[0] > best:
+                best, chosen = result
+            if best == target:
+                for f in futures:
+                    f.cancel()
+                break
+    return {items[order[i]] for i in chosen}
+
+
+def _dp_engine(items, values, target):
+    if not _qualifies_for_dp(values, target):
+        raise ValueError("DP needs non-negative int values and a positive int target")
+    return _dp_solve(items, values, target)
+
+
+def _collection_solve(items, values, target):
+    """
+    The Collection search, carrying each subset's running sum so every
+    candidate costs one addition no matter how many items it holds.
+    """
+    # remaining[i] is the total of values[i:], used to prune the collection.
+    # Pruning assumes nothing negative is still to come.
+    remaining = None
+    if all(v >= 0 for v in values):
+        remaining = [0] * (len(values) + 1)
+        for i in range(len(values) - 1, -1, -1):
+            remaining[i] = values[i] + remaining[i + 1]
+
+    col = Collection(LinkedSubset)
+    for i, x in enumerate(items):
+        result = col.expand_by(x, target,
+                               None if remaining is None else remaining[i + 1],
+                               values[i])
         if result is not None:
             return result.to_set()
     return col.max_subset.to_set()
 
 
+# Engines selectable through the method= argument of subset_sum() and
+# subset_sum_flex().  Each one takes (items, values, target) and returns a set.
+_ENGINES = {
+    "collection": _collection_solve,
+    "dp": _dp_engine,
+    "mitm": _mitm_solve,
+    "bnb": _bnb_solve,
+    "parallel": _parallel_solve,
+}
+
+
+def _run_engine(method, items, values, target):
+    try:
+        engine = _ENGINES[method]
+    except KeyError:
+        raise ValueError(f"Unknown method {method!r}") from None
+    return engine(items, values, target)
+
+
+def subset_sum(s, target, method=None):
+    """
+    Iterative subset sum algorithm. Returns a Python set of items.
+    Raises ValueError if input has duplicates.
+
+    Non-negative int inputs are handed to the DP engine (see subset_sum_dp()),
+    which finds the same subset without building every Subset, unless
+    the target and the total both exceed 2^n (see _default_method()).
+    method picks an engine explicitly: "collection", "dp", "mitm"
+    (meet in the middle, for targets too large for the DP) or "bnb"
+    (iterative branch and bound, see subset_sum_rec()) or "parallel"
+    (branch and bound on every core, see subset_sum_parallel()).
+    """
+    items = list(s)
+    if len(items) != len(set(items)):
+        raise ValueError("Input contains duplicates")
+
+    # 0 + x turns an iTunesEntry into its run time (see __radd__)
+    values = [0 + x for x in items]
+    if method is None:
+        method = _default_method(values, target)
+    return _run_engine(method, items, values, target)
+
+
 def subset_sum_rec(s, target):
     """
     Recursive subset sum algorithm. Returns a Python set of items.
+
+    This copies the set on both branches and recurses once per item, so it
+    only suits small inputs; subset_sum(s, target, method="bnb") does the
+    same include/exclude search without copies or recursion, with pruning.
     """
     items = list(s)
     if len(items) != len(set(items)):
@@ -123,15 +553,27 @@ def subset_sum_rec(s, target):
 
 
 # Extra credit: flexible version
-def subset_sum_flex(s, target, value_of=lambda x: x):
+def subset_sum_flex(s, target, value_of=lambda x: x, method=None):
     """
     Extra-credit version: allows caller to specify how to compute value
     of each item (e.g., lambda x: x.run_time for iTunesEntry).
+
+    value_of is called once per item up front, and the engines carry running
+    sums from there.  method selects the engine, same names as subset_sum();
+    "naive" is the original version that re-sums every candidate set.
     """
     items = list(s)
     if len(items) != len(set(items)):
         raise ValueError("Input contains duplicates")
 
+    if method != "naive":
+        # 0 + turns an iTunesEntry left as is by value_of into its run
+        # time, same as sum() does in the naive version
+        values = [0 + value_of(x) for x in items]
+        if method is None:
+            method = _default_method(values, target)
+        return _run_engine(method, items, values, target)
+
     col = [set()]  # start with empty set
 
     for x in items:
@@ -150,6 +592,136 @@ def subset_sum_flex(s, target, value_of=lambda x: x):
     return max(col, key=lambda subset: sum(value_of(i) for i in subset))
 
 
+def subset_sum_parallel(s, target, value_of=lambda x: x, workers=None,
+                        prefix_len=None):
+    """
+    Branch and bound over a pool of worker processes (os.cpu_count() by
+    default).  The search is split on the include/exclude choices of the
+    first prefix_len items, 2^prefix_len tasks in all.
+    Returns a Python set of items.  Values must be non-negative.
+    """
+    items = list(s)
+    if len(items) != len(set(items)):
+        raise ValueError("Input contains duplicates")
+    return _parallel_solve(items, [0 + value_of(x) for x in items], target,
+                           workers, prefix_len)
+
+
+def subset_sum_indices(values, target, method=None):
+    """
+    Subset sum over a sequence of values (e.g. iTunesCatalog.run_times)
+    rather than items.  Returns the sorted list of chosen indices, so
+    repeated values are fine and no item objects are ever built.
+    method is the same as for subset_sum().  iTunesEntry objects count as
+    their run times, as in subset_sum().
+    """
+    values = [0 + v for v in values]
+    if method is None:
+        method = _default_method(values, target)
+    return sorted(_run_engine(method, range(len(values)), values, target))
+
+
+def subset_sum_batch(s, targets, value_of=lambda x: x):
+    """
+    Answer many targets over the same items at once.  Returns a list with
+    the best Python set of items for each target, in the order given.
+
+    The reachable sums are computed once, up to the largest target, and every
+    target is a binary search into them.  Non-negative int values use the DP
+    bitset (same answers as subset_sum()); anything else uses a table of
+    sum -> bitmask.
+    """
+    items = list(s)
+    if len(items) != len(set(items)):
+        raise ValueError("Input contains duplicates")
+    targets = list(targets)
+    if not targets:
+        return []
+    values = [0 + value_of(x) for x in items]
+    limit = max(targets)
+
+    if _default_method(values, limit) == "dp":
+        limit = min(limit, sum(values))
+        reach, parent = _reachable_sums(values, limit)
+        bits = bin(reach)[:1:-1]
+        sums = [r for r in range(len(bits)) if bits[r] == "1"]
+
+        def rebuild(total):
+            return _rebuild(items, values, parent, total)
+    else:
+        table = _half_sums(values,
+                           limit if all(v >= 0 for v in values) else None)
+        sums = sorted(table)
+
+        def rebuild(total):
+            mask = table[total]
+            return {item for i, item in enumerate(items) if (mask >> i) & 1}
+
+    results = []
+    for target in targets:
+        i = bisect_right(sums, target) - 1
+        results.append(rebuild(sums[i]) if i >= 0 else set())
+    return results
+
+
+def subset_sum_iter(s, target, value_of=lambda x: x, time_budget=None,
+                    max_iterations=None):
+    """
+    Anytime subset sum: a generator yielding Python sets of items, each with
+    a larger sum than the one before, as the Collection expands.
+
+    Items are expanded largest first so good answers show up early.  One
+    iteration is one item expanded; the generator stops after
+    max_iterations of them or once time_budget seconds have passed (an
+    expansion in progress is cut short too), so the last set yielded is the
+    best found in the budget.
+    """
+    items = list(s)
+    if len(items) != len(set(items)):
+        raise ValueError("Input contains duplicates")
+    values = [0 + value_of(x) for x in items]
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+
+    order = sorted(range(len(items)), key=values.__getitem__, reverse=True)
+    remaining = None
+    if all(v >= 0 for v in values):
+        remaining = [0] * (len(order) + 1)
+        for k in range(len(order) - 1, -1, -1):
+            remaining[k] = values[order[k]] + remaining[k + 1]
+
+    col = Collection(LinkedSubset)
+    best = col.max_subset
+    yield best.to_set()
+    for k, i in enumerate(order):
+        if max_iterations is not None and k >= max_iterations:
+            return
+        if deadline is not None and time.perf_counter() >= deadline:
+            return
+        result = col.expand_by(items[i], target,
+                               None if remaining is None else remaining[k + 1],
+                               values[i], deadline)
+        if result is not None:
+            yield result.to_set()
+            return
+        if col.max_subset.sum > best.sum:
+            best = col.max_subset
+            yield best.to_set()
+
+
+def subset_sum_anytime(s, target, value_of=lambda x: x, time_budget=None,
+                       max_iterations=None, callback=None):
+    """
+    Run subset_sum_iter() until it finishes or the budget runs out, and
+    return the best Python set of items found.  callback, if given, is
+    called with every improved set as it's found (progress reporting).
+    """
+    best = set()
+    for best in subset_sum_iter(s, target, value_of, time_budget, max_iterations):
+        if callback is not None:
+            callback(best)
+    return best
+
+
 if __name__ == "__main__":
     # Simple manual tests
     print("subset_sum([] , 10) =", subset_sum([], 10))
@@ -5,9 +5,17 @@ Student: Selma Emekci
 Automated tests for assignment01.py using unittest.
 """
 
+import itertools
 import unittest
-from assignment01 import subset_sum, subset_sum_rec, subset_sum_flex
-from itunes import iTunesEntryReader
+import random
+from unittest import mock
+
+from assignment01 import (Collection, LinkedSubset, Subset, subset_sum,
+                          subset_sum_rec, subset_sum_flex, subset_sum_dp,
+                          subset_sum_parallel, subset_sum_batch,
+                          subset_sum_iter, subset_sum_anytime,
+                          subset_sum_indices)
+from itunes import iTunesCatalog, iTunesEntryReader
 
 
 class TestSubsetSum(unittest.TestCase):
@@ -64,6 +72,255 @@ class TestSubsetSum(unittest.TestCase):
         self.assertLessEqual(total, 40)
         self.assertEqual(total, 40)
 
+    def test_flex_default_value_of_itunes(self):
+        itunes = iTunesEntryReader("Subset Sum Problem/itunes_file.txt")
+        result = subset_sum_flex(itunes, 3600)
+        self.assertEqual(sum(entry.run_time for entry in result), 3600)
+        first = list(itunes)[:12]
+        self.assertEqual(subset_sum_flex(first, 1000, method="collection"),
+                         subset_sum(first, 1000, method="collection"))
+
+    def test_dp_matches_collection(self):
+        # Force the Collection path with a non-int target so the two can be compared
+        rng = random.Random(3)
+        for _ in range(200):
+            nums = rng.sample(range(1, 60), rng.randint(0, 10))
+            target = rng.randint(1, 200)
+            self.assertEqual(subset_sum_dp(nums, target),
+                             subset_sum(nums, float(target)))
+
+    def test_dp_many_items(self):
+        nums = list(range(1000, 1060))  # 60 items, way too many for 2^n
+        result = subset_sum(nums, 12345)
+        self.assertEqual(sum(result), 12345)
+
+    def test_huge_target_skips_dp(self):
+        # A bitset up to 3 * 10**10 would need gigabytes
+        nums = [10**10 + 7 * i for i in range(6)]
+        target = 3 * 10**10 + 7
+        result = subset_sum(nums, target)
+        self.assertEqual(sum(result), sum(subset_sum(nums, target,
+                                                     method="collection")))
+        self.assertEqual(subset_sum_batch(nums, [target]), [result])
+
+    def test_dp_rejects_non_ints(self):
+        with self.assertRaises(ValueError):
+            subset_sum_dp([1.5, 2], 3)
+        with self.assertRaises(ValueError):
+            subset_sum_dp([-1, 2], 3)
+
+    def test_mitm_matches_dp(self):
+        rng = random.Random(5)
+        for _ in range(200):
+            nums = rng.sample(range(1, 60), rng.randint(0, 12))
+            target = rng.randint(1, 300)
+            result = subset_sum(nums, target, method="mitm")
+            self.assertLessEqual(sum(result), target)
+            self.assertEqual(sum(result), sum(subset_sum(nums, target)))
+
+    def test_mitm_negative_values(self):
+        nums = [6, 33, -1, 26, 10, 8, 37]
+        result = subset_sum(nums, 35, method="mitm")
+        self.assertEqual(sum(result), 35)
+        self.assertEqual(sum(subset_sum_batch(nums, [35])[0]), 35)
+        rng = random.Random(8)
+        for _ in range(100):
+            nums = rng.sample(range(-20, 60), rng.randint(0, 10))
+            target = rng.randint(1, 150)
+            best = max(s for s in (sum(c) for r in range(len(nums) + 1)
+                                   for c in itertools.combinations(nums, r))
+                       if s <= target)
+            self.assertEqual(sum(subset_sum(nums, target, method="mitm")), best)
+
+    def test_mitm_itunes_large_target(self):
+        itunes = list(iTunesEntryReader("Subset Sum Problem/itunes_file.txt"))[:40]
+        target = 2 * 3600
+        result = subset_sum_flex(itunes, target, value_of=lambda x: x.run_time,
+                                 method="mitm")
+        self.assertEqual(sum(entry.run_time for entry in result), target)
+
+    def test_collection_one_subset_per_sum(self):
+        # Run times clustered around 180-300 seconds share lots of partial sums
+        rng = random.Random(7)
+        times = rng.sample(range(180, 300), 30)
+        col = Collection()
+        for t in times:
+            col.expand_by(t, 3 * 3600)
+        self.assertLessEqual(len(col), 3 * 3600 + 1)
+        self.assertLess(len(col), 2 ** 20)
+
+    def test_collection_pruning_keeps_best(self):
+        itunes = list(iTunesEntryReader("Subset Sum Problem/itunes_file.txt"))
+        result = subset_sum(itunes, 20000)
+        self.assertEqual(sum(entry.run_time for entry in result), 20000)
+
+    def test_linked_subset_matches_subset(self):
+        plain, linked = Subset(), LinkedSubset()
+        for x in [4, 8, 15]:
+            plain.add(x)
+            linked.add(x)
+        branch = linked.copy()
+        branch.add(16)
+        self.assertEqual(linked.to_set(), {4, 8, 15})
+        self.assertEqual(linked.sum, plain.sum)
+        self.assertEqual(branch.to_set(), {4, 8, 15, 16})
+        self.assertEqual(branch.sum, 43)
+        self.assertEqual(LinkedSubset().to_set(), set())
+
+    def test_collection_linked_subsets(self):
+        nums = [25, 27, 3, 12, 6, 15, 9, 30, 21, 19]
+        for subset_type in (Subset, LinkedSubset):
+            col = Collection(subset_type)
+            for x in nums:
+                result = col.expand_by(x, 50)
+                if result is not None:
+                    break
+            self.assertEqual(result.to_set(), {25, 6, 19})
+
+    def test_flex_calls_value_of_once_per_item(self):
+        itunes = list(iTunesEntryReader("Subset Sum Problem/itunes_file.txt"))[:20]
+        calls = []
+
+        def run_time(entry):
+            calls.append(entry)
+            return entry.run_time
+
+        for method in (None, "collection"):
+            calls.clear()
+            result = subset_sum_flex(itunes, 1800, value_of=run_time, method=method)
+            self.assertEqual(len(calls), len(itunes))
+            self.assertEqual(sum(entry.run_time for entry in result), 1800)
+
+    def test_flex_cached_matches_naive(self):
+        nums = [25, 27, 3, 12, 6, 15, 9, 30, 21, 19]
+        for target in (13, 50, 101, 500):
+            self.assertEqual(subset_sum_flex(nums, target, value_of=lambda x: x / 2),
+                             subset_sum_flex(nums, target, value_of=lambda x: x / 2,
+                                             method="naive"))
+
+    def test_bnb_matches_rec(self):
+        rng = random.Random(11)
+        for _ in range(200):
+            nums = rng.sample(range(1, 60), rng.randint(0, 10))
+            target = rng.randint(1, 200)
+            self.assertEqual(sum(subset_sum(nums, target, method="bnb")),
+                             sum(subset_sum_rec(nums, target)))
+
+    def test_bnb_hundreds_of_items(self):
+        # Far deeper than the recursion limit would allow subset_sum_rec
+        nums = random.Random(13).sample(range(1, 100000), 2000)
+        result = subset_sum(nums, 5000000, method="bnb")
+        self.assertEqual(sum(result), 5000000)
+
+    def test_bnb_floats_exact_hit(self):
+        # Undoing 19.5 and 16.2 by subtraction left 3.55e-15 instead of 0
+        nums = [9.8, 10.9, 15.8, 16.2, 17.1, 15.4, 19.5]
+        expected = {9.8, 10.9, 15.8}
+        self.assertEqual(subset_sum(nums, 36.5, method="collection"), expected)
+        self.assertEqual(subset_sum(nums, 36.5, method="bnb"), expected)
+        self.assertEqual(subset_sum_parallel(nums, 36.5, workers=2), expected)
+
+    def test_bnb_rejects_negative(self):
+        with self.assertRaises(ValueError):
+            subset_sum([-1, 2], 3, method="bnb")
+
+    def test_parallel_matches_dp(self):
+        rng = random.Random(17)
+        for _ in range(5):
+            nums = rng.sample(range(1, 60), 12)
+            target = rng.randint(1, 400)
+            result = subset_sum_parallel(nums, target, workers=2)
+            self.assertEqual(sum(result), sum(subset_sum(nums, target)))
+
+    def test_parallel_itunes(self):
+        itunes = iTunesEntryReader("Subset Sum Problem/itunes_file.txt")
+        result = subset_sum_flex(itunes, 3600, value_of=lambda x: x.run_time,
+                                 method="parallel")
+        self.assertEqual(sum(entry.run_time for entry in result), 3600)
+
+    def test_parallel_and_bnb_default_value_of(self):
+        itunes = list(iTunesEntryReader("Subset Sum Problem/itunes_file.txt"))
+        result = subset_sum_parallel(itunes, 3600, workers=2)
+        self.assertEqual(sum(entry.run_time for entry in result), 3600)
+        result = subset_sum_flex(itunes, 3600, method="bnb")
+        self.assertEqual(sum(entry.run_time for entry in result), 3600)
+
+    def test_batch_matches_single(self):
+        nums = [25, 27, 3, 12, 6, 15, 9, 30, 21, 19]
+        targets = [50, 2, 13, 1000, 100]
+        self.assertEqual(subset_sum_batch(nums, targets),
+                         [subset_sum(nums, t) for t in targets])
+        self.assertEqual(subset_sum_batch(nums, []), [])
+
+    def test_batch_itunes_playlists(self):
+        itunes = iTunesEntryReader("Subset Sum Problem/itunes_file.txt")
+        targets = [1800, 3600, 2 * 3600]
+        results = subset_sum_batch(itunes, targets, value_of=lambda x: x.run_time)
+        for target, result in zip(targets, results):
+            self.assertEqual(sum(entry.run_time for entry in result), target)
+
+    def test_batch_default_value_of(self):
+        itunes = iTunesEntryReader("Subset Sum Problem/itunes_file.txt")
+        results = subset_sum_batch(itunes, [500, 3600])
+        self.assertEqual([sum(entry.run_time for entry in result)
+                          for result in results], [500, 3600])
+
+    def test_iter_yields_improving_subsets(self):
+        itunes = iTunesEntryReader("Subset Sum Problem/itunes_file.txt")
+        sums = [sum(entry.run_time for entry in subset)
+                for subset in subset_sum_iter(itunes, 3600,
+                                              value_of=lambda x: x.run_time)]
+        self.assertEqual(sums[0], 0)
+        self.assertEqual(sums, sorted(set(sums)))
+        self.assertEqual(sums[-1], 3600)
+
+    def test_anytime_budget(self):
+        nums = [25, 27, 3, 12, 6, 15, 9, 30, 21, 19]
+        seen = []
+        result = subset_sum_anytime(nums, 1000, max_iterations=2,
+                                    callback=seen.append)
+        self.assertEqual(result, {30, 27})  # only the two largest were tried
+        self.assertEqual(seen[-1], result)
+        self.assertEqual(subset_sum_anytime(nums, 50, time_budget=0), set())
+        self.assertEqual(sum(subset_sum_anytime(nums, 50, time_budget=10)), 50)
+
+    def test_anytime_default_value_of(self):
+        itunes = iTunesEntryReader("Subset Sum Problem/itunes_file.txt")
+        result = subset_sum_anytime(itunes, 500)
+        self.assertEqual(sum(entry.run_time for entry in result), 500)
+
+    def test_anytime_budget_cuts_expansion(self):
+        # Each float expansion roughly doubles the Collection, so the
+        # deadline has to be checked inside an expansion, not just between
+        rng = random.Random(1)
+        col = Collection(LinkedSubset)
+        for _ in range(12):
+            col.expand_by(rng.random() * 100, 10**6)
+        before = len(col)
+        self.assertGreater(before, 2048)
+
+        # A clock that passes the deadline right after the first check
+        clock = itertools.chain([0.0], itertools.repeat(100.0))
+        with mock.patch("assignment01.time.perf_counter",
+                        side_effect=lambda: next(clock)):
+            col.expand_by(rng.random() * 100, 10**6, deadline=1.0)
+        self.assertGreater(len(col), before)
+        self.assertLessEqual(len(col), before + 1024)
+
+    def test_indices_on_catalog(self):
+        catalog = iTunesCatalog.from_file("Subset Sum Problem/itunes_file.txt")
+        chosen = subset_sum_indices(catalog.run_times, 3600)
+        self.assertEqual(sum(catalog.run_times[i] for i in chosen), 3600)
+        # Repeated values are fine since indices are distinct
+        self.assertEqual(subset_sum_indices([5, 5, 5], 10), [0, 1])
+        itunes = list(iTunesEntryReader("Subset Sum Problem/itunes_file.txt"))
+        chosen = subset_sum_indices(itunes, 500)
+        self.assertEqual(sum(itunes[i].run_time for i in chosen), 500)
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            subset_sum([1, 2], 3, method="nope")
+
 
 if __name__ == "__main__":
     unittest.main()
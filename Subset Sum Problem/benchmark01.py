@@ -0,0 +1,182 @@
+"""
+CS3C, Assignment #1, Subset Sum (benchmarks)
+Student: Selma Emekci
+
+Times the subset sum engines in assignment01.py on reproducible int and
+iTunesEntry workloads as n and the target grow, records peak memory with
+tracemalloc, and writes the results as CSV and/or JSON so runs can be
+compared between releases.
+
+Usage: python benchmark01.py --sizes 10 20 30 --csv out.csv --json out.json
+"""
+
+import argparse
+import csv
+import json
+import platform
+import random
+import time
+import tracemalloc
+
+from assignment01 import subset_sum, subset_sum_rec, subset_sum_flex
+from itunes import iTunesEntry
+
+
+def _value(x):
+    """Value of an int or iTunesEntry (see iTunesEntry.__radd__)."""
+    return 0 + x
+
+
+# name -> (function(items, target), largest n worth timing or None).
+# The exponential ones get a cap so a run finishes in reasonable time.
+ENGINES = {
+    "subset_sum": (lambda items, target: subset_sum(items, target), None),
+    "collection": (lambda items, target:
+                   subset_sum(items, target, method="collection"), 200),
+    "dp": (lambda items, target: subset_sum(items, target, method="dp"), None),
+    "mitm": (lambda items, target:
+             subset_sum(items, target, method="mitm"), 36),
+    "bnb": (lambda items, target: subset_sum(items, target, method="bnb"), None),
+    "parallel": (lambda items, target:
+                 subset_sum(items, target, method="parallel"), None),
+    "subset_sum_rec": (lambda items, target: subset_sum_rec(items, target), 16),
+    "subset_sum_flex": (lambda items, target:
+                        subset_sum_flex(items, target, value_of=_value), None),
+    "subset_sum_flex_naive": (lambda items, target:
+                              subset_sum_flex(items, target, value_of=_value,
+                                              method="naive"), 14),
+}
+
+
+def _rng(seed, *key):
+    # str seeds are hashed with sha512 by random, so this is reproducible
+    # across processes (unlike hash()).
+    return random.Random("-".join(str(k) for k in (seed,) + key))
+
+
+def make_int_workload(n, scale, seed=0):
+    """n distinct ints in [1, scale); target is half their total."""
+    items = _rng(seed, "int", n, scale).sample(range(1, scale), n)
+    return items, sum(items) // 2
+
+
+def make_itunes_workload(n, scale, seed=0):
+    """
+    n distinct iTunesEntry objects with run times in [120, 120 + scale)
+    seconds; target is half their total run time.
+    """
+    rng = _rng(seed, "itunes", n, scale)
+    items = [iTunesEntry(f"Artist {rng.randrange(n)}", f"Song {i}",
+                         120 + rng.randrange(scale))
+             for i in range(n)]
+    return items, sum(entry.run_time for entry in items) // 2
+
+
+WORKLOADS = {
+    "int": make_int_workload,
+    "itunes": make_itunes_workload,
+}
+
+
+def time_call(func, *args):
+    """
+    Return (result, seconds, peak bytes).  Time and memory come from two
+    separate calls, because tracemalloc itself slows things down a lot.
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, seconds, peak
+
+
+def run(sizes, scales=(1000,), engines=None, workloads=None, seed=0,
+        verbose=False):
+    """
+    Time every engine on every workload, size and scale.
+    Returns a list of dicts, one per measurement.
+    """
+    if engines is None:
+        engines = list(ENGINES)
+    if workloads is None:
+        workloads = list(WORKLOADS)
+
+    rows = []
+    for workload in workloads:
+        for scale in scales:
+            for n in sizes:
+                items, target = WORKLOADS[workload](n, scale, seed)
+                for name in engines:
+                    func, max_n = ENGINES[name]
+                    if max_n is not None and n > max_n:
+                        continue
+                    result, seconds, peak = time_call(func, items, target)
+                    row = {
+                        "workload": workload,
+                        "engine": name,
+                        "n": n,
+                        "scale": scale,
+                        "target": target,
+                        "seed": seed,
+                        "best_sum": sum(_value(x) for x in result),
+                        "seconds": seconds,
+                        "peak_kib": peak / 1024,
+                    }
+                    rows.append(row)
+                    if verbose:
+                        print(f"{workload:7} {name:22} n={n:<4} "
+                              f"target={target:<8} {seconds:10.4f} s "
+                              f"{row['peak_kib']:10.1f} KiB")
+    return rows
+
+
+FIELDS = ["workload", "engine", "n", "scale", "target", "seed", "best_sum",
+          "seconds", "peak_kib"]
+
+
+def write_csv(rows, filename):
+    with open(filename, "w", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_json(rows, filename):
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": rows,
+    }
+    with open(filename, "w") as fh:
+        json.dump(report, fh, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark subset sum engines")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10, 14, 18, 24, 30, 40])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1000, 100000],
+                        help="item value range; the target grows with it")
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES))
+    parser.add_argument("--workloads", nargs="+", choices=list(WORKLOADS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", help="write results to this CSV file")
+    parser.add_argument("--json", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    rows = run(args.sizes, args.scales, args.engines, args.workloads,
+               args.seed, verbose=True)
+    if args.csv:
+        write_csv(rows, args.csv)
+    if args.json:
+        write_json(rows, args.json)
+
+
+if __name__ == "__main__":
+    main()
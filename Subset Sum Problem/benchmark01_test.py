@@ -0,0 +1,61 @@
+"""
+CS3C, Assignment #1, Subset Sum (benchmark tests)
+Student: Selma Emekci
+
+Checks that the benchmark workloads are reproducible and the reports are
+written out.
+"""
+
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from benchmark01 import (make_int_workload, make_itunes_workload, run,
+                         write_csv, write_json)
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_workloads_reproducible(self):
+        self.assertEqual(make_int_workload(20, 1000, seed=1),
+                         make_int_workload(20, 1000, seed=1))
+        self.assertNotEqual(make_int_workload(20, 1000, seed=1),
+                            make_int_workload(20, 1000, seed=2))
+        tunes1, target1 = make_itunes_workload(15, 200, seed=1)
+        tunes2, target2 = make_itunes_workload(15, 200, seed=1)
+        self.assertEqual(tunes1, tunes2)
+        self.assertEqual(target1, target2)
+        self.assertEqual(len(set(tunes1)), 15)
+
+    def test_run_and_write(self):
+        rows = run([8, 12], engines=["subset_sum", "bnb", "subset_sum_rec"])
+        self.assertEqual(len(rows), 2 * 2 * 3)  # workloads * sizes * engines
+        for row in rows:
+            self.assertLessEqual(row["best_sum"], row["target"])
+            self.assertGreater(row["peak_kib"], 0)
+
+        # Every engine finds the same best sum on the same workload
+        best = {}
+        for row in rows:
+            key = (row["workload"], row["n"])
+            self.assertEqual(best.setdefault(key, row["best_sum"]), row["best_sum"])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_name = os.path.join(tmp, "bench.csv")
+            json_name = os.path.join(tmp, "bench.json")
+            write_csv(rows, csv_name)
+            write_json(rows, json_name)
+            with open(csv_name, newline="") as fh:
+                self.assertEqual(len(list(csv.DictReader(fh))), len(rows))
+            with open(json_name) as fh:
+                self.assertEqual(json.load(fh)["results"], rows)
+
+    def test_caps_exponential_engines(self):
+        rows = run([20], workloads=["int"], engines=["subset_sum_rec", "dp"])
+        self.assertEqual([row["engine"] for row in rows], ["dp"])
+
+
+if __name__ == "__main__":
+    unittest.main()
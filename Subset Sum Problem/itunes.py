@@ -5,6 +5,16 @@ Modified by Zibin Yang.
 Modified by Selma Emekci.
 """
 
+import io
+import locale
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
 from functools import total_ordering
 
@@ -115,17 +125,414 @@ class iTunesEntry:
             raise ValueError
 
 
+class FrozeniTunesEntry:
+    """
+    Immutable, slotted iTunesEntry for set- and sort-heavy work.
+
+    The hash is computed once at construction (same value as iTunesEntry's,
+    so the two can be mixed in sets), and comparisons go straight to the
+    run time instead of checking sort_by.
+    """
+    __slots__ = ("_artist", "_title", "_run_time", "_hash")
+
+    def __init__(self, artist, title, run_time):
+        # __setattr__ is blocked below, so go around it
+        object.__setattr__(self, "_artist", artist)
+        object.__setattr__(self, "_title", title)
+        object.__setattr__(self, "_run_time", run_time)
+        object.__setattr__(self, "_hash", hash((artist, title, run_time)))
+
+    @classmethod
+    def from_entry(cls, entry):
+        return cls(entry.artist, entry.title, entry.run_time)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        # copy and pickle would otherwise restore the slots with setattr();
+        # rebuilding through __init__ also recomputes the hash, since str
+        # hashes differ between processes.
+        return (FrozeniTunesEntry, (self._artist, self._title, self._run_time))
+
+    @property
+    def title(self):
+        return self._title
+
+    @property
+    def artist(self):
+        return self._artist
+
+    @property
+    def run_time(self):
+        return self._run_time
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if type(other) is FrozeniTunesEntry:
+            # Different hashes can't be equal; skips most string compares
+            return (self._hash == other._hash
+                    and self._run_time == other._run_time
+                    and self._artist == other._artist
+                    and self._title == other._title)
+        return (self._artist == other.artist
+                and self._title == other.title
+                and self._run_time == other.run_time)
+
+    # Spelled out rather than @total_ordering, which adds a call per compare
+    def __lt__(self, other):
+        if type(other) is FrozeniTunesEntry:
+            return self._run_time < other._run_time
+        return self._run_time < other.run_time
+
+    def __le__(self, other):
+        if type(other) is FrozeniTunesEntry:
+            return self._run_time <= other._run_time
+        return self._run_time <= other.run_time
+
+    def __gt__(self, other):
+        if type(other) is FrozeniTunesEntry:
+            return self._run_time > other._run_time
+        return self._run_time > other.run_time
+
+    def __ge__(self, other):
+        if type(other) is FrozeniTunesEntry:
+            return self._run_time >= other._run_time
+        return self._run_time >= other.run_time
+
+    def __radd__(self, other):
+        return other + self._run_time
+
+    def __add__(self, other):
+        if isinstance(other, (int, float)):
+            return self._run_time + other
+        return self._run_time + other.run_time
+
+    __str__ = iTunesEntry.__str__
+    __repr__ = iTunesEntry.__repr__
+
+
+@total_ordering
+class iTunesEntryView:
+    """
+    Lightweight view of one song in an iTunesCatalog.  Only holds the
+    catalog and an index; fields are looked up in the catalog's columns.
+    Hashes and compares equal to the iTunesEntry with the same fields.
+    """
+    __slots__ = ("_catalog", "_index")
+
+    def __init__(self, catalog, index):
+        self._catalog = catalog
+        self._index = index
+
+    @property
+    def title(self):
+        catalog = self._catalog
+        return catalog._strings[catalog._titles[self._index]]
+
+    @property
+    def artist(self):
+        catalog = self._catalog
+        return catalog._strings[catalog._artists[self._index]]
+
+    @property
+    def run_time(self):
+        return self._catalog._run_times[self._index]
+
+    # These only use the properties above, so iTunesEntry's work as is
+    __hash__ = iTunesEntry.__hash__
+    __eq__ = iTunesEntry.__eq__
+    __add__ = iTunesEntry.__add__
+    __radd__ = iTunesEntry.__radd__
+    __str__ = iTunesEntry.__str__
+    __repr__ = iTunesEntry.__repr__
+
+    def __lt__(self, other):
+        return self.run_time < other.run_time
+
+
+class iTunesCatalog:
+    """
+    Column store for large catalogs.  Run times live in an array('i'),
+    artist and title are indices into one table of interned strings, so a
+    song costs a few machine ints instead of a whole iTunesEntry object.
+    Indexing gives an iTunesEntryView; sorting and summing by run time work
+    on the array directly (see run_times).
+    """
+
+    def __init__(self, entries=()):
+        self._run_times = array("i")
+        self._artists = array("i")
+        self._titles = array("i")
+        self._strings = []
+        self._string_ids = {}
+        for entry in entries:
+            self.append(entry.artist, entry.title, entry.run_time)
+
+    @classmethod
+    def from_file(cls, filename):
+        """Load an itunes file straight into columns, no iTunesEntry built."""
+        catalog = cls()
+        for artist, title, run_time in iTunesEntryReader._records(filename):
+            catalog.append(artist, title, run_time)
+        return catalog
+
+    def _intern(self, s):
+        string_id = self._string_ids.get(s)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(s)
+            self._string_ids[s] = string_id
+        return string_id
+
+    def append(self, artist, title, run_time):
+        self._artists.append(self._intern(artist))
+        self._titles.append(self._intern(title))
+        self._run_times.append(run_time)
+
+    @property
+    def run_times(self):
+        """The run time column, an array('i') indexed like the catalog."""
+        return self._run_times
+
+    def total_run_time(self):
+        return sum(self._run_times)
+
+    def sort_by_run_time(self):
+        """Sort the catalog by run time (stable), moving ints, not objects."""
+        order = sorted(range(len(self)), key=self._run_times.__getitem__)
+        self._run_times = array("i", (self._run_times[i] for i in order))
+        self._artists = array("i", (self._artists[i] for i in order))
+        self._titles = array("i", (self._titles[i] for i in order))
+
+    def __len__(self):
+        return len(self._run_times)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError
+        return iTunesEntryView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield iTunesEntryView(self, index)
+
+
+def _parse_chunk(filename, start, end):
+    """
+    Parse the records in bytes [start, end) of an itunes file, which must
+    start on a record's "#" line.  Runs in a worker process, so it's module
+    level and returns plain tuples, which are cheap to send back.
+    """
+    with open(filename, "rb") as fh:
+        fh.seek(start)
+        data = fh.read(end - start)
+    # Same decoding and universal newlines as open(filename, "r"), and the
+    # same loop as _records(), so the 3 lines after a "#" line are always
+    # read as a record, even if they start with "#" themselves
+    fh = io.StringIO(data.decode(locale.getpreferredencoding(False)),
+                     newline=None)
+    records = []
+    while True:
+        line = fh.readline()
+        if iTunesEntryReader._is_data_line(line):
+            records.append(iTunesEntryReader._read_one_entry(fh))
+        elif line == "":
+            break
+    return records
+
+
 class iTunesEntryReader:
+    # Read buffer for stream(), big enough that multi-GB exports aren't
+    # read a few KB at a time
+    BUFFER_SIZE = 1 << 20
+
+    # Binary sidecar cache, written next to the text file as <filename>.cache:
+    #   header   magic, version, source mtime (ns), source size, record count
+    #   int32    run time of each record
+    #   int64    2 * count + 1 offsets into the string blob (artist, title, ...)
+    #   blob     UTF-8 artist and title strings, back to back
+    # All little-endian.  It's only used if the source mtime and size match.
+    CACHE_MAGIC = b"ITC1"
+    CACHE_VERSION = 1
+    _CACHE_HEADER = struct.Struct("<4sIqqI")
+
+    def __init__(self, filename, use_cache=False, entry_type=iTunesEntry,
+                 workers=None):
+        """
+        If use_cache, load from the sidecar cache when it's up to date, and
+        (re)write it after parsing the text file otherwise.
+        entry_type is the class built for each record, e.g.
+        FrozeniTunesEntry for set- or sort-heavy work.
+        workers > 1 parses the text in that many processes (see
+        _records_parallel()), for big exports.
+        """
+        records = None
+        if use_cache:
+            records = iTunesEntryReader._load_cache(filename)
+        if records is None:
+            if workers is not None and workers > 1:
+                records = iTunesEntryReader._records_parallel(filename, workers)
+            else:
+                records = list(iTunesEntryReader._records(filename))
+            if use_cache:
+                iTunesEntryReader._write_cache(filename, records)
+        self._tunes = [entry_type(*record) for record in records]
+        # Secondary indexes, built by build_indexes() on the first lookup
+        self._indexed = False
+
+    @staticmethod
+    def _records_parallel(filename, workers, chunks_per_worker=4):
+        """
+        Split the file into byte ranges that start at a "#" record line (see
+        _record_start()),
+        parse them in a process pool and return all the records in file
+        order, like list(_records(filename)).
+        """
+        size = os.path.getsize(filename)
+        nchunks = workers * chunks_per_worker
+        with open(filename, "rb") as fh:
+            starts = sorted({iTunesEntryReader._record_start(fh, k * size // nchunks)
+                             for k in range(nchunks)})
+        ends = starts[1:] + [size]
+
+        records = []
+        with ProcessPoolExecutor(workers) as executor:
+            # map() hands the results back in the order of the chunks
+            for chunk in executor.map(_parse_chunk, [filename] * len(starts),
+                                      starts, ends):
+                records.extend(chunk)
+        return records
+
+    # A line that is just "#": a record starts there.  Titles and artists can
+    # start with "#" too ("#9 Dream"), so only whole "#" lines are safe
+    # places to split the file.
+    _RECORD_LINE = re.compile(rb"[\r\n]#(?:\r\n|\r|\n)")
+
+    @staticmethod
+    def _record_start(fh, pos, block_size=1 << 16):
+        """Offset of the first line that is just "#" at or after pos."""
+        if pos == 0:
+            return 0
+        fh.seek(pos - 1)
+        carry = b""
+        block_start = pos - 1
+        while True:
+            block = fh.read(block_size)
+            if not block:
+                return block_start + len(carry)
+            data = carry + block
+            match = iTunesEntryReader._RECORD_LINE.search(data)
+            if match:
+                return block_start + match.start() + 1
+            # Keep the last bytes in case a match straddles two blocks
+            carry = data[-3:]
+            block_start += len(data) - len(carry)
+
+    @staticmethod
+    def cache_filename(filename):
+        return f"{filename}.cache"
+
+    @staticmethod
+    def _write_cache(filename, records):
+        stat = os.stat(filename)
+        run_times = array("i")
+        offsets = array("q", [0])
+        blob = bytearray()
+        for artist, title, run_time in records:
+            run_times.append(run_time)
+            for s in (artist, title):
+                blob += s.encode("utf-8")
+                offsets.append(len(blob))
+        if sys.byteorder == "big":
+            run_times.byteswap()
+            offsets.byteswap()
+
+        header = iTunesEntryReader._CACHE_HEADER.pack(
+            iTunesEntryReader.CACHE_MAGIC, iTunesEntryReader.CACHE_VERSION,
+            stat.st_mtime_ns, stat.st_size, len(records))
+        cache_filename = iTunesEntryReader.cache_filename(filename)
+        tmp_filename = cache_filename + ".tmp"
+        try:
+            with open(tmp_filename, "wb") as fh:
+                fh.write(header)
+                fh.write(run_times.tobytes())
+                fh.write(offsets.tobytes())
+                fh.write(blob)
+            # Readers never see a half-written cache
+            os.replace(tmp_filename, cache_filename)
+        except OSError:
+            # The cache is only an optimization, e.g. the directory may be
+            # read-only; just parse the text next time.
+            pass
+
+    @staticmethod
+    def _load_cache(filename):
+        """
+        Return the list of (artist, title, run_time) from the sidecar cache,
+        or None if there's no cache or it doesn't match the source file.
+        """
+        header_size = iTunesEntryReader._CACHE_HEADER.size
+        try:
+            stat = os.stat(filename)
+            fh = open(iTunesEntryReader.cache_filename(filename), "rb")
+        except OSError:
+            return None
+        with fh:
+            # mmap can't map an empty file
+            if os.fstat(fh.fileno()).st_size < header_size:
+                return None
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        with mm:
+            magic, version, mtime_ns, size, count = \
+                iTunesEntryReader._CACHE_HEADER.unpack_from(mm)
+            if (magic != iTunesEntryReader.CACHE_MAGIC
+                    or version != iTunesEntryReader.CACHE_VERSION
+                    or mtime_ns != stat.st_mtime_ns or size != stat.st_size):
+                return None
+
+            run_times = array("i")
+            offsets = array("q")
+            run_times_end = header_size + count * run_times.itemsize
+            offsets_end = run_times_end + (2 * count + 1) * offsets.itemsize
+            if len(mm) < offsets_end:
+                return None
+            run_times.frombytes(mm[header_size:run_times_end])
+            offsets.frombytes(mm[run_times_end:offsets_end])
+            if sys.byteorder == "big":
+                run_times.byteswap()
+                offsets.byteswap()
+            blob = mm[offsets_end:]
+        if len(blob) != offsets[-1]:
+            return None
+
+        strings = [blob[offsets[i]:offsets[i + 1]].decode("utf-8")
+                   for i in range(2 * count)]
+        return list(zip(strings[0::2], strings[1::2], run_times))
 
-    def __init__(self, filename):
-        self._tunes = []
+    @staticmethod
+    def stream(filename, buffer_size=BUFFER_SIZE, entry_type=iTunesEntry):
+        """
+        Generator yielding one iTunesEntry (or entry_type) per record as it's
+        parsed, so memory stays constant no matter how big the file is, and
+        consumers (subset_sum_flex(), quick_sort(), ...) can start right away.
+        """
+        for record in iTunesEntryReader._records(filename, buffer_size):
+            yield entry_type(*record)
 
+    @staticmethod
+    def _records(filename, buffer_size=BUFFER_SIZE):
+        """Generator yielding (artist, title, run_time) for each record."""
         # zb: making sure fh is closed properly
-        with open(filename, "r") as fh:
+        with open(filename, "r", buffering=buffer_size) as fh:
             while True:
                 line = fh.readline()
                 if iTunesEntryReader._is_data_line(line):
-                    self._tunes.append(iTunesEntry(*self._read_one_entry(fh)))
+                    yield iTunesEntryReader._read_one_entry(fh)
                 elif line == "":
                     break
 
@@ -137,7 +544,8 @@ class iTunesEntryReader:
             return True
         return False
 
-    def _read_one_entry(self, fh):
+    @staticmethod
+    def _read_one_entry(fh):
         """
         reads 3 lines from the input stream, for example
 
@@ -172,7 +580,10 @@ class iTunesEntryReader:
 
     def __setitem__(self, key, value):
         if key >= len(self._tunes):
-            self._tunes.extend(key + 1)
+            self._tunes.extend([None] * (key + 1 - len(self._tunes)))
+        if self._indexed:
+            self._unindex(self._tunes[key])
+            self._index(value)
         self._tunes[key] = value
 
     def __len__(self):
@@ -185,6 +596,77 @@ class iTunesEntryReader:
 
     def insert_one_item(self, location, entry):
         self._tunes.insert(location, entry)
+        if self._indexed:
+            self._index(entry)
+
+    def build_indexes(self):
+        """
+        Build the artist, title and run time indexes.  The lookups below do
+        this on first use; after that insert_one_item() and __setitem__()
+        keep them up to date.
+        """
+        self._by_artist = {}
+        self._by_title = {}
+        # Sorted run times, and the entries in the same order
+        self._run_time_keys = []
+        self._run_time_entries = []
+        self._indexed = True
+        for entry in self._tunes:
+            self._index(entry)
+
+    def _index(self, entry):
+        if entry is None:
+            return
+        self._by_artist.setdefault(entry.artist, []).append(entry)
+        self._by_title.setdefault(entry.title, []).append(entry)
+        i = bisect_right(self._run_time_keys, entry.run_time)
+        self._run_time_keys.insert(i, entry.run_time)
+        self._run_time_entries.insert(i, entry)
+
+    def _unindex(self, entry):
+        if entry is None:
+            return
+        for index, key in ((self._by_artist, entry.artist),
+                           (self._by_title, entry.title)):
+            bucket = index[key]
+            # By identity, like the run time index below: remove() would
+            # take the first equal entry, which may be a different object
+            for i, other in enumerate(bucket):
+                if other is entry:
+                    del bucket[i]
+                    break
+            if not bucket:
+                del index[key]
+        lo = bisect_left(self._run_time_keys, entry.run_time)
+        hi = bisect_right(self._run_time_keys, entry.run_time)
+        for i in range(lo, hi):
+            if self._run_time_entries[i] is entry:
+                del self._run_time_keys[i]
+                del self._run_time_entries[i]
+                break
+
+    def find_by_artist(self, artist):
+        """Return a list of the tunes by artist (hash lookup)."""
+        if not self._indexed:
+            self.build_indexes()
+        return list(self._by_artist.get(artist, ()))
+
+    def find_by_title(self, title):
+        """Return a list of the tunes with this title (hash lookup)."""
+        if not self._indexed:
+            self.build_indexes()
+        return list(self._by_title.get(title, ()))
+
+    def find_by_run_time(self, low, high):
+        """
+        Return a list of the tunes with low <= run_time <= high, shortest
+        first, e.g. find_by_run_time(180, 240).  O(log n + k) with bisect.
+        """
+        if not self._indexed:
+            self.build_indexes()
+        lo = bisect_left(self._run_time_keys, low)
+        hi = bisect_right(self._run_time_keys, high)
+        return self._run_time_entries[lo:hi]
 
 
 if __name__ == '__main__':
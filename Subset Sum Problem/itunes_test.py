@@ -0,0 +1,248 @@
+"""
+iTunes reader tests.
+Selma Emekci
+"""
+
+import copy
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from itunes import (FrozeniTunesEntry, iTunesCatalog, iTunesEntry,
+                    iTunesEntryReader)
+
+ITUNES_FILE = (Path(__file__).resolve().parent / "itunes_file.txt").as_posix()
+
+
+class iTunesEntryReaderTests(unittest.TestCase):
+
+    def test_reader(self):
+        tunes = iTunesEntryReader(ITUNES_FILE)
+        self.assertEqual(len(tunes), 78)
+        self.assertEqual(tunes[0], iTunesEntry("Carrie Underwood",
+                                               "Cowboy Casanova", 236))
+
+    def test_stream_matches_reader(self):
+        stream = iTunesEntryReader.stream(ITUNES_FILE)
+        self.assertEqual(next(stream), iTunesEntry("Carrie Underwood",
+                                                   "Cowboy Casanova", 236))
+        rest = list(stream)
+        self.assertEqual(rest, list(iTunesEntryReader(ITUNES_FILE))[1:])
+
+    def test_stream_small_buffer(self):
+        self.assertEqual(list(iTunesEntryReader.stream(ITUNES_FILE, buffer_size=16)),
+                         list(iTunesEntryReader(ITUNES_FILE)))
+
+    def test_parallel_parse(self):
+        expected = list(iTunesEntryReader(ITUNES_FILE))
+        for workers in (2, 3):
+            self.assertEqual(list(iTunesEntryReader(ITUNES_FILE, workers=workers)),
+                             expected)
+
+    def test_record_start(self):
+        with open(ITUNES_FILE, "rb") as fh:
+            data = fh.read()
+            for pos in (0, 1, 5, 100, len(data) - 3):
+                start = iTunesEntryReader._record_start(fh, pos, block_size=4)
+                self.assertGreaterEqual(start, pos)
+                self.assertTrue(start == len(data)
+                                or data[start:start + 3] == b"#\r\n")
+                self.assertTrue(start == 0 or data[start - 1:start] == b"\n")
+                self.assertNotIn(b"\n#\r\n", data[pos:start])
+
+    def test_parallel_parse_hash_titles(self):
+        # Titles and artists starting with "#" mustn't be taken for records
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "hash_titles.txt")
+            with open(filename, "w", newline="") as fh:
+                for i in range(40):
+                    fh.write(f"#\r\n#1 Crush {i}\r\n#9 Dream {i}\r\n"
+                             f"{200 + i}\r\n\r\n")
+            expected = list(iTunesEntryReader(filename))
+            self.assertEqual(len(expected), 40)
+            self.assertEqual(expected[9].title, "#9 Dream 9")
+            for workers in (2, 3, 4):
+                self.assertEqual(list(iTunesEntryReader(filename,
+                                                        workers=workers)),
+                                 expected)
+
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "itunes_file.txt")
+            shutil.copy(ITUNES_FILE, filename)
+            expected = list(iTunesEntryReader(filename))
+
+            self.assertEqual(list(iTunesEntryReader(filename, use_cache=True)),
+                             expected)
+            cache_filename = iTunesEntryReader.cache_filename(filename)
+            self.assertTrue(os.path.exists(cache_filename))
+
+            # Warm start doesn't parse the text at all
+            with mock.patch.object(iTunesEntryReader, "_records",
+                                   side_effect=AssertionError("parsed")):
+                self.assertEqual(list(iTunesEntryReader(filename, use_cache=True)),
+                                 expected)
+
+            # Changing the source invalidates the cache
+            with open(filename, "a") as fh:
+                fh.write("#\nNew Artist\nNew Song\n100\n")
+            tunes = iTunesEntryReader(filename, use_cache=True)
+            self.assertEqual(len(tunes), len(expected) + 1)
+            self.assertEqual(tunes[len(expected)].title, "New Song")
+
+    def test_cache_rejects_garbage(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "itunes_file.txt")
+            shutil.copy(ITUNES_FILE, filename)
+            with open(iTunesEntryReader.cache_filename(filename), "wb") as fh:
+                fh.write(b"not a cache")
+            self.assertIsNone(iTunesEntryReader._load_cache(filename))
+            self.assertEqual(len(iTunesEntryReader(filename, use_cache=True)), 78)
+            self.assertIsNotNone(iTunesEntryReader._load_cache(filename))
+            open(iTunesEntryReader.cache_filename(filename), "wb").close()
+            self.assertIsNone(iTunesEntryReader._load_cache(filename))
+
+
+class FrozeniTunesEntryTests(unittest.TestCase):
+
+    def test_same_as_entry(self):
+        entry = iTunesEntry("Eric Clapton", "Pretending", 283)
+        frozen = FrozeniTunesEntry.from_entry(entry)
+        self.assertEqual(frozen, entry)
+        self.assertEqual(entry, frozen)
+        self.assertEqual(hash(frozen), hash(entry))
+        self.assertEqual(len({entry, frozen}), 1)
+        self.assertEqual(str(frozen), str(entry))
+        self.assertEqual(frozen + 17, 300)
+        self.assertEqual(17 + frozen, 300)
+        self.assertEqual(frozen + frozen, 566)
+        self.assertEqual(frozen + entry, 566)
+        self.assertEqual(sum([frozen, frozen]), 566)
+
+    def test_ordering(self):
+        short = FrozeniTunesEntry("A", "Short", 100)
+        long_ = FrozeniTunesEntry("B", "Long", 300)
+        self.assertTrue(short < long_ and short <= long_)
+        self.assertTrue(long_ > short and long_ >= short)
+        self.assertTrue(short < iTunesEntry("C", "Mixed", 200))
+        self.assertNotEqual(short, long_)
+
+    def test_immutable(self):
+        frozen = FrozeniTunesEntry("A", "Song", 100)
+        with self.assertRaises(AttributeError):
+            frozen.run_time = 5
+        with self.assertRaises(AttributeError):
+            frozen._run_time = 5
+        with self.assertRaises(AttributeError):
+            frozen.extra = 1
+
+    def test_copy_and_pickle(self):
+        frozen = FrozeniTunesEntry("A", "Song", 100)
+        for clone in (copy.copy(frozen), copy.deepcopy(frozen),
+                      pickle.loads(pickle.dumps(frozen))):
+            self.assertIsInstance(clone, FrozeniTunesEntry)
+            self.assertEqual(frozen, clone)
+            self.assertEqual(hash(frozen), hash(clone))
+            with self.assertRaises(AttributeError):
+                clone.run_time = 5
+
+    def test_reader_entry_type(self):
+        tunes = iTunesEntryReader(ITUNES_FILE, entry_type=FrozeniTunesEntry)
+        self.assertIsInstance(tunes[0], FrozeniTunesEntry)
+        self.assertEqual(list(tunes), list(iTunesEntryReader(ITUNES_FILE)))
+        self.assertEqual(sorted(tunes), sorted(iTunesEntryReader(ITUNES_FILE)))
+
+
+class iTunesIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tunes = iTunesEntryReader(ITUNES_FILE)
+
+    def test_lookups(self):
+        by_artist = self.tunes.find_by_artist("Carrie Underwood")
+        self.assertEqual(by_artist, [t for t in self.tunes
+                                     if t.artist == "Carrie Underwood"])
+        self.assertEqual([t.title for t in self.tunes.find_by_title("Quitter")],
+                         ["Quitter"])
+        self.assertEqual(self.tunes.find_by_artist("Nobody"), [])
+
+        in_range = self.tunes.find_by_run_time(180, 240)
+        self.assertEqual(sorted(in_range),
+                         sorted(t for t in self.tunes if 180 <= t.run_time <= 240))
+        self.assertEqual([t.run_time for t in in_range],
+                         sorted(t.run_time for t in in_range))
+
+    def test_maintained_incrementally(self):
+        self.tunes.build_indexes()
+        song = iTunesEntry("New Artist", "New Song", 200)
+        self.tunes.insert_one_item(0, song)
+        self.assertEqual(self.tunes.find_by_artist("New Artist"), [song])
+        self.assertIn(song, self.tunes.find_by_run_time(200, 200))
+
+        replacement = iTunesEntry("Other Artist", "Other Song", 500)
+        self.tunes[0] = replacement
+        self.assertEqual(self.tunes.find_by_artist("New Artist"), [])
+        self.assertEqual(self.tunes.find_by_title("Other Song"), [replacement])
+        self.assertNotIn(song, self.tunes.find_by_run_time(200, 200))
+        self.assertEqual(self.tunes.find_by_run_time(500, 500), [replacement])
+
+        appended = iTunesEntry("Far Artist", "Far Song", 10)
+        self.tunes[len(self.tunes)] = appended
+        self.assertEqual(self.tunes.find_by_run_time(0, 10), [appended])
+
+    def test_unindex_by_identity(self):
+        first = iTunesEntry("Twin", "Same Song", 100)
+        second = iTunesEntry("Twin", "Same Song", 100)
+        self.tunes.insert_one_item(0, first)
+        self.tunes.insert_one_item(1, second)
+        self.tunes.build_indexes()
+        self.tunes[1] = iTunesEntry("Other", "Other Song", 100)
+        for found in (self.tunes.find_by_artist("Twin"),
+                      self.tunes.find_by_title("Same Song"),
+                      [t for t in self.tunes.find_by_run_time(100, 100)
+                       if t.artist == "Twin"]):
+            self.assertEqual(len(found), 1)
+            self.assertIs(found[0], first)
+
+
+class iTunesCatalogTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tunes = list(iTunesEntryReader(ITUNES_FILE))
+        self.catalog = iTunesCatalog.from_file(ITUNES_FILE)
+
+    def test_views_match_entries(self):
+        self.assertEqual(len(self.catalog), len(self.tunes))
+        self.assertEqual(list(self.catalog), self.tunes)
+        self.assertEqual(set(self.catalog), set(self.tunes))
+        view = self.catalog[3]
+        self.assertEqual(str(view), str(self.tunes[3]))
+        self.assertEqual(view + 1, self.tunes[3].run_time + 1)
+        self.assertEqual(sum(self.catalog), self.catalog.total_run_time())
+        with self.assertRaises(IndexError):
+            self.catalog[len(self.catalog)]
+        self.assertEqual(self.catalog[-1], self.tunes[-1])
+        self.assertEqual(self.catalog[-len(self.tunes)], self.tunes[0])
+        with self.assertRaises(IndexError):
+            self.catalog[-len(self.catalog) - 1]
+
+    def test_strings_interned(self):
+        catalog = iTunesCatalog()
+        catalog.append("Foo Fighters", "All My Life", 263)
+        catalog.append("Foo Fighters", "Monkey Wrench", 230)
+        self.assertEqual(len(catalog._strings), 3)
+        self.assertEqual(catalog[1].artist, "Foo Fighters")
+
+    def test_sort_by_run_time(self):
+        self.catalog.sort_by_run_time()
+        self.assertEqual(list(self.catalog.run_times),
+                         sorted(tune.run_time for tune in self.tunes))
+        self.assertEqual(list(self.catalog), sorted(self.tunes))
+
+
+if __name__ == "__main__":
+    unittest.main()